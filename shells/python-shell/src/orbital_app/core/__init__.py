@@ -8,13 +8,22 @@ Core utilities for Orbital Python Shell.
 - bindings: @entity, @payload binding resolution
 - firebase: Firebase Admin SDK initialization
 - websocket: Real-time WebSocket connection management
+- serialization: JSON encoding (orjson when installed)
 """
 from .settings import Settings, get_settings
 from .event_router import EventRequest, EventResponse
 from .effect_executor import EffectExecutor
 from .repository import Repository, InMemoryRepository, FirestoreRepository
 from .bindings import resolve_binding, resolve_bindings_in_dict
-from .firebase import initialize_firebase, get_auth, get_firestore, verify_id_token
+from .firebase import (
+    initialize_firebase,
+    get_auth,
+    get_firestore,
+    get_async_firestore,
+    verify_id_token,
+    get_cached_id_token,
+    clear_token_cache,
+)
 from .event_bus import EventBus, get_event_bus
 from .websocket import ConnectionManager, connection_manager
 
@@ -32,7 +41,10 @@ __all__ = [
     "initialize_firebase",
     "get_auth",
     "get_firestore",
+    "get_async_firestore",
     "verify_id_token",
+    "get_cached_id_token",
+    "clear_token_cache",
     "EventBus",
     "get_event_bus",
     "ConnectionManager",
@@ -6,7 +6,45 @@ Bindings are references to values in the execution context:
 - @entity.field - Value from the current entity
 - @user.field - Value from the authenticated user
 """
-from typing import Any, Dict
+from functools import lru_cache
+import sys
+from typing import Any, Callable, Dict, List
+
+Resolver = Callable[[Dict[str, Any]], Any]
+
+
+@lru_cache(maxsize=4096)
+def _compile_binding(value: str) -> Resolver:
+    """
+    Parse a binding string once into a resolver over the context.
+
+    Args:
+        value: Binding string of the form @root.path.to.field
+
+    Returns:
+        A function that resolves the binding against a context
+    """
+    # Interned segments let context/entity dict lookups match keys by identity
+    root, *rest = (sys.intern(part) for part in value[1:].split("."))
+    path = tuple(rest)
+
+    def resolve(context: Dict[str, Any]) -> Any:
+        if root not in context:
+            return None
+
+        result = context[root]
+
+        for part in path:
+            if result is None:
+                return None
+            if isinstance(result, dict):
+                result = result.get(part)
+            else:
+                result = getattr(result, part, None)
+
+        return result
+
+    return resolve
 
 
 def resolve_binding(value: Any, context: Dict[str, Any]) -> Any:
@@ -20,36 +58,24 @@ def resolve_binding(value: Any, context: Dict[str, Any]) -> Any:
     Returns:
         The resolved value
     """
-    if not isinstance(value, str):
-        return value
-
-    if not value.startswith("@"):
+    # Most values are literals - a single slice compare rules out bindings
+    if not isinstance(value, str) or value[:1] != "@":
         return value
 
-    # Parse binding: @root.path.to.field
-    parts = value[1:].split(".")
-    root = parts[0]
-
-    if root not in context:
-        return None
-
-    result = context[root]
-
-    for part in parts[1:]:
-        if result is None:
-            return None
-        if isinstance(result, dict):
-            result = result.get(part)
-        else:
-            result = getattr(result, part, None)
-
-    return result
+    return _compile_binding(value)(context)
 
 
 def resolve_bindings_in_dict(data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
     """
     Recursively resolve all bindings in a dictionary.
 
+    Binding strings are parsed once and cached, so only the context lookups
+    run per call. Every dict and list in the result is a fresh container,
+    so callers can modify it without touching the template.
+
+    Uses an explicit stack rather than recursion: each nested dict gets an
+    empty result dict up front, which is filled in when it is popped.
+
     Args:
         data: Dictionary that may contain binding references
         context: The execution context
@@ -57,19 +83,28 @@ def resolve_bindings_in_dict(data: Dict[str, Any], context: Dict[str, Any]) -> D
     Returns:
         Dictionary with all bindings resolved
     """
-    result = {}
-    for key, value in data.items():
-        if isinstance(value, str):
-            result[key] = resolve_binding(value, context)
-        elif isinstance(value, dict):
-            result[key] = resolve_bindings_in_dict(value, context)
-        elif isinstance(value, list):
-            result[key] = [
-                resolve_bindings_in_dict(item, context) if isinstance(item, dict)
-                else resolve_binding(item, context) if isinstance(item, str)
-                else item
-                for item in value
-            ]
-        else:
-            result[key] = value
+    result: Dict[str, Any] = {}
+    stack = [(data, result)]
+
+    while stack:
+        source, target = stack.pop()
+        for key, value in source.items():
+            if isinstance(value, dict):
+                nested: Dict[str, Any] = {}
+                stack.append((value, nested))
+                target[key] = nested
+            elif isinstance(value, list):
+                items: List[Any] = []
+                for item in value:
+                    # Only dicts and strings inside lists are resolved
+                    if isinstance(item, dict):
+                        nested = {}
+                        stack.append((item, nested))
+                        items.append(nested)
+                    else:
+                        items.append(resolve_binding(item, context))
+                target[key] = items
+            else:
+                target[key] = resolve_binding(value, context)
+
     return result
@@ -9,19 +9,81 @@ Server-side effects (per Orbital_Execution_Model.md):
 
 Client-side effects are collected and returned in response.clientEffects.
 """
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from functools import lru_cache
+import asyncio
+
 from .repository import Repository
 from .bindings import resolve_binding
 
 
+@lru_cache(maxsize=1024)
+def _compile_setter(target: str) -> Optional[Callable[[Dict[str, Any], Any], None]]:
+    """
+    Parse a set target like @entity.field.sub once into a writer.
+
+    Missing intermediate dicts are created. Returns None for targets that
+    don't name a field (e.g. a bare @entity).
+    """
+    root, *path = target[1:].split(".")
+    if not path:
+        return None
+    parents = tuple(path[:-1])
+    final_field = path[-1]
+
+    def write(context: Dict[str, Any], value: Any) -> None:
+        if root not in context:
+            return
+        obj = context[root]
+        for part in parents:
+            if isinstance(obj, dict):
+                obj = obj.setdefault(part, {})
+            else:
+                obj = getattr(obj, part, {})
+        # Set the final field
+        if isinstance(obj, dict):
+            obj[final_field] = value
+        else:
+            setattr(obj, final_field, value)
+
+    return write
+
+
+# (nn_forward, train_loop), resolved on the first nn/* or train/* effect.
+# Both are None when PyTorch is not available.
+_nn_ops: Optional[Tuple[Optional[Callable[..., Any]], Optional[Callable[..., Any]]]] = None
+
+
+def _load_nn_ops() -> Tuple[Optional[Callable[..., Any]], Optional[Callable[..., Any]]]:
+    """Import the PyTorch runtime once, without loading torch at module import."""
+    global _nn_ops
+    if _nn_ops is None:
+        try:
+            from ..nn.forward import forward as nn_forward
+            from ..nn.training import train_loop
+
+            _nn_ops = (nn_forward, train_loop)
+        except ImportError:
+            # PyTorch not available
+            _nn_ops = (None, None)
+    return _nn_ops
+
+
 class EffectExecutor:
-    """Executes server-side effects and collects client-side effects."""
+    """
+    Executes server-side effects and collects client-side effects.
+
+    An executor handles a single event: single-entity reads are cached for
+    its lifetime (until the next persist), so create one per event.
+    """
 
     def __init__(self, repository: Repository):
         self.repository = repository
         self.data: Dict[str, Any] = {}
         self.client_effects: List[Any] = []
         self.effect_results: List[Dict[str, Any]] = []
+        # (entity_type, entity_id) -> in-flight or completed read
+        self._read_cache: Dict[Tuple[str, Any], asyncio.Future] = {}
 
     async def execute(self, effect: List[Any], context: Dict[str, Any]) -> Optional[Any]:
         """Execute a single effect."""
@@ -30,35 +92,26 @@ class EffectExecutor:
 
         effect_type = effect[0]
 
-        # Server-side effects
-        if effect_type == "fetch":
-            return await self._execute_fetch(effect, context)
-        elif effect_type == "persist":
-            return await self._execute_persist(effect, context)
-        elif effect_type == "call_service":
-            return await self._execute_call_service(effect, context)
-        elif effect_type == "set":
-            return await self._execute_set(effect, context)
-
-        # Client-side effects - add to response
-        elif effect_type in ("render_ui", "render-ui"):
-            self.client_effects.append(effect)
-        elif effect_type == "navigate":
-            self.client_effects.append(effect)
-        elif effect_type == "notify":
-            self.client_effects.append(effect)
-        elif effect_type == "emit":
-            # emit can be both client and server side
-            self.client_effects.append(effect)
+        entry = self._DISPATCH.get(effect_type)
+        if entry is not None:
+            handler, is_coro = entry
+            if is_coro:
+                return await handler(self, effect, context)
+            return handler(self, effect, context)
 
         # PyTorch effects
-        elif effect_type.startswith("nn/") or effect_type.startswith("train/"):
-            return await self._execute_pytorch(effect, context)
-        elif effect_type.startswith("tensor/"):
-            return await self._execute_tensor(effect, context)
+        if isinstance(effect_type, str):
+            if effect_type[:3] == "nn/" or effect_type[:6] == "train/":
+                return await self._execute_pytorch(effect, context)
+            if effect_type[:7] == "tensor/":
+                return await self._execute_tensor(effect, context)
 
         return None
 
+    def _client_effect(self, effect: List[Any], context: Dict[str, Any]) -> None:
+        """Queue a client-side effect for the response."""
+        self.client_effects.append(effect)
+
     async def _execute_fetch(
         self, effect: List[Any], context: Dict[str, Any]
     ) -> Optional[Any]:
@@ -67,17 +120,19 @@ class EffectExecutor:
         options = effect[2] if len(effect) > 2 else {}
 
         if "id" in options:
-            # Single entity fetch
-            entity_id = resolve_binding(options["id"], context)
-            result = await self.repository.get(entity_type, entity_id)
-            self.data[entity_type] = result
+            # Single entity fetch, shared with any identical read this event
+            key = (entity_type, resolve_binding(options["id"], context))
+            read = self._read_cache.get(key)
+            if read is None:
+                read = asyncio.ensure_future(self.repository.get(*key))
+                self._read_cache[key] = read
+            self.data[entity_type] = await read
         else:
             # Collection fetch with optional filter
             filter_expr = options.get("filter")
-            results = await self.repository.list(entity_type, filter_expr, context)
-            self.data[entity_type] = results
+            self.data[entity_type] = await self.repository.list(entity_type, filter_expr, context)
 
-        return self.data.get(entity_type)
+        return self.data[entity_type]
 
     async def _execute_persist(
         self, effect: List[Any], context: Dict[str, Any]
@@ -86,6 +141,7 @@ class EffectExecutor:
         action = effect[1]  # 'create', 'update', 'delete'
         entity_type = effect[2]
         data = resolve_binding(effect[3], context) if len(effect) > 3 else {}
+        self._read_cache.clear()
 
         result = None
         if action == "create":
@@ -140,23 +196,10 @@ class EffectExecutor:
         target = effect[1]  # e.g., "@entity.field"
         value = resolve_binding(effect[2], context) if len(effect) > 2 else None
 
-        # Parse target binding
         if isinstance(target, str) and target.startswith("@"):
-            parts = target[1:].split(".")
-            root = parts[0]
-            if root in context and len(parts) > 1:
-                obj = context[root]
-                for part in parts[1:-1]:
-                    if isinstance(obj, dict):
-                        obj = obj.get(part, {})
-                    else:
-                        obj = getattr(obj, part, {})
-                # Set the final field
-                final_field = parts[-1]
-                if isinstance(obj, dict):
-                    obj[final_field] = value
-                else:
-                    setattr(obj, final_field, value)
+            write = _compile_setter(target)
+            if write is not None:
+                write(context, value)
 
         self.effect_results.append(
             {"effect": "set", "target": target, "value": value, "success": True}
@@ -169,22 +212,19 @@ class EffectExecutor:
         """Execute PyTorch neural network operations."""
         op = effect[0]
 
-        try:
-            from ..nn.forward import forward as nn_forward
-            from ..nn.training import train_loop
+        nn_forward, train_loop = _nn_ops or _load_nn_ops()
+        if nn_forward is None:
+            return None
 
-            if op == "nn/forward":
-                module = resolve_binding(effect[1], context)
-                input_tensor = resolve_binding(effect[2], context)
-                return nn_forward(module, input_tensor)
-            elif op == "train/loop":
-                module = resolve_binding(effect[1], context)
-                data = resolve_binding(effect[2], context)
-                config = resolve_binding(effect[3], context)
-                return train_loop(module, data, config)
-        except ImportError:
-            # PyTorch not available
-            pass
+        if op == "nn/forward":
+            module = resolve_binding(effect[1], context)
+            input_tensor = resolve_binding(effect[2], context)
+            return nn_forward(module, input_tensor)
+        elif op == "train/loop":
+            module = resolve_binding(effect[1], context)
+            data = resolve_binding(effect[2], context)
+            config = resolve_binding(effect[3], context)
+            return train_loop(module, data, config)
 
         return None
 
@@ -194,3 +234,23 @@ class EffectExecutor:
         """Execute tensor operations."""
         # Tensor ops are typically used in expressions, not as standalone effects
         return None
+
+    # effect type -> (unbound handler, is_coroutine_function), built once at
+    # import rather than per executor
+    _DISPATCH: Dict[str, Tuple[Callable[..., Any], bool]] = {
+        effect_type: (handler, asyncio.iscoroutinefunction(handler))
+        for effect_type, handler in (
+            # Server-side effects
+            ("fetch", _execute_fetch),
+            ("persist", _execute_persist),
+            ("call_service", _execute_call_service),
+            ("set", _execute_set),
+            # Client-side effects - add to response
+            ("render_ui", _client_effect),
+            ("render-ui", _client_effect),
+            ("navigate", _client_effect),
+            ("notify", _client_effect),
+            # emit can be both client and server side
+            ("emit", _client_effect),
+        )
+    }
@@ -4,9 +4,11 @@ Event Bus
 Provides event publishing and subscription for Orbital traits.
 """
 
-from typing import Dict, Any, Callable, List, Optional
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
 from dataclasses import dataclass, field
 import asyncio
+import inspect
+import itertools
 
 
 @dataclass
@@ -25,8 +27,12 @@ class EventBus:
     """
 
     def __init__(self):
-        self._subscriptions: Dict[str, List[EventSubscription]] = {}
+        # event -> token -> subscription (dicts keep subscription order)
+        self._subscriptions: Dict[str, Dict[int, EventSubscription]] = {}
+        # event -> subscriptions as emit dispatches them, rebuilt after changes
+        self._dispatch: Dict[str, Tuple[Tuple[int, EventSubscription], ...]] = {}
         self._pending_events: List[tuple] = []
+        self._next_token = itertools.count().__next__
 
     def subscribe(
         self,
@@ -45,48 +51,107 @@ class EventBus:
         Returns:
             A function to unsubscribe
         """
-        if event not in self._subscriptions:
-            self._subscriptions[event] = []
-
+        token = self._next_token()
         sub = EventSubscription(event=event, handler=handler, once=once)
-        self._subscriptions[event].append(sub)
+        self._subscriptions.setdefault(event, {})[token] = sub
+        self._dispatch.pop(event, None)
+
+        def unsubscribe():
+            self._unsubscribe(event, (token,))
+
+        return unsubscribe
+
+    def subscribe_many(
+        self,
+        event: str,
+        handlers: Iterable[Callable],
+        once: bool = False,
+    ) -> Callable:
+        """
+        Subscribe several handlers to an event at once.
+
+        Args:
+            event: The event name to subscribe to
+            handlers: The callback functions, called in the given order
+            once: If True, each handler is unsubscribed after its first call
+
+        Returns:
+            A function to unsubscribe all of them
+        """
+        new_subs = {
+            self._next_token(): EventSubscription(event=event, handler=handler, once=once)
+            for handler in handlers
+        }
+        self._subscriptions.setdefault(event, {}).update(new_subs)
+        self._dispatch.pop(event, None)
 
         def unsubscribe():
-            if event in self._subscriptions:
-                self._subscriptions[event] = [
-                    s for s in self._subscriptions[event] if s != sub
-                ]
+            self._unsubscribe(event, new_subs)
 
         return unsubscribe
 
+    def _unsubscribe(self, event: str, tokens: Iterable[int]) -> None:
+        """Remove subscriptions, dropping the event once none are left."""
+        subs = self._subscriptions.get(event)
+        if subs is None:
+            return
+        self._dispatch.pop(event, None)
+        for token in tokens:
+            subs.pop(token, None)
+        if not subs:
+            del self._subscriptions[event]
+
     async def emit(self, event: str, payload: Optional[Dict[str, Any]] = None) -> None:
         """
         Emit an event to all subscribers.
 
+        Handlers are called in subscription order; the awaitables returned by
+        async handlers are then awaited concurrently, so a slow handler
+        doesn't delay the rest.
+
         Args:
             event: The event name
             payload: Optional event payload
         """
-        if event not in self._subscriptions:
+        subs = self._subscriptions.get(event)
+        if not subs:
             return
 
-        to_remove = []
-        for sub in self._subscriptions[event]:
+        payload = payload or {}
+        pending = []
+        # Snapshot so handlers can subscribe/unsubscribe while we dispatch;
+        # kept between emits until the subscriptions change.
+        dispatch = self._dispatch.get(event)
+        if dispatch is None:
+            dispatch = self._dispatch[event] = tuple(subs.items())
+        # One-time subscriptions are removed as they are dispatched, so an
+        # emit from inside a handler (or a concurrent one) can't call them again.
+        for token, sub in dispatch:
+            if sub.once:
+                if subs.pop(token, None) is None:
+                    continue
+                self._dispatch.pop(event, None)
             try:
-                if asyncio.iscoroutinefunction(sub.handler):
-                    await sub.handler(payload or {})
-                else:
-                    sub.handler(payload or {})
-
-                if sub.once:
-                    to_remove.append(sub)
+                result = sub.handler(payload)
             except Exception as e:
                 # Log error but continue processing
                 print(f"Error in event handler for {event}: {e}")
-
-        # Remove one-time subscriptions
-        for sub in to_remove:
-            self._subscriptions[event].remove(sub)
+                continue
+            # Async handlers (coroutine functions, partials of them, objects
+            # with an async __call__) are awaited together below
+            if inspect.isawaitable(result):
+                pending.append(result)
+
+        # (A handler may have unsubscribed everything and subscribed anew)
+        if not subs and self._subscriptions.get(event) is subs:
+            del self._subscriptions[event]
+            self._dispatch.pop(event, None)
+
+        if pending:
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error in event handler for {event}: {result}")
 
     def clear(self, event: Optional[str] = None) -> None:
         """
@@ -98,8 +163,10 @@ class EventBus:
         """
         if event:
             self._subscriptions.pop(event, None)
+            self._dispatch.pop(event, None)
         else:
             self._subscriptions.clear()
+            self._dispatch.clear()
 
 
 # Default global event bus instance
@@ -10,6 +10,8 @@ This follows the Orbital Execution Model:
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 
+from .serialization import FastJSONResponse
+
 
 class EventRequest(BaseModel):
     """Request body for event endpoints."""
@@ -36,3 +38,13 @@ class EventResponse(BaseModel):
     clientEffects: List[Any] = []
     effectResults: List[Dict[str, Any]] = []
     error: Optional[str] = None
+
+    def to_response(self, status_code: int = 200) -> FastJSONResponse:
+        """
+        Serialize straight to a JSON response.
+
+        Encodes with orjson when available, skipping FastAPI's
+        response_model re-validation and jsonable_encoder pass. Keep
+        response_model=EventResponse on the route for the OpenAPI schema.
+        """
+        return FastJSONResponse(self.model_dump(), status_code=status_code)
@@ -7,13 +7,28 @@ Supports multiple initialization modes:
 - Inline credentials (FIREBASE_PROJECT_ID + CLIENT_EMAIL + PRIVATE_KEY)
 - Application default credentials (Cloud Run, etc.)
 """
+import hashlib
 import os
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 import firebase_admin
-from firebase_admin import credentials, auth, firestore
+from firebase_admin import credentials, auth, firestore, firestore_async
 
 
 _app: Optional[firebase_admin.App] = None
+_firestore_client: Optional[firestore.Client] = None
+_init_lock = threading.Lock()
+
+# Verified ID tokens: sha256(token) -> (monotonic expiry, decoded claims).
+# Keyed by digest so raw bearer tokens aren't kept in memory. Entries live
+# for at most _TOKEN_CACHE_TTL seconds and never past the token's exp.
+_TOKEN_CACHE_TTL = 300.0
+_TOKEN_CACHE_SIZE = 10_000
+_token_cache: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+# verify_id_token runs in worker threads; guards every _token_cache access
+_token_cache_lock = threading.Lock()
 
 
 def _get_env(key: str, default: str = "") -> str:
@@ -25,17 +40,26 @@ def initialize_firebase() -> firebase_admin.App:
     """
     Initialize Firebase Admin SDK.
 
-    Returns the Firebase app instance, initializing if needed.
+    Returns the Firebase app instance, initializing if needed. Safe to call
+    from multiple threads - only the first caller initializes.
     """
     global _app
 
-    if _app is not None:
+    app = _app
+    if app is not None:
+        return app
+
+    with _init_lock:
+        if _app is None:
+            _app = _create_app()
         return _app
 
+
+def _create_app() -> firebase_admin.App:
+    """Create the Firebase app from the environment (call under _init_lock)."""
     # Check if already initialized
     if firebase_admin._apps:
-        _app = firebase_admin.get_app()
-        return _app
+        return firebase_admin.get_app()
 
     project_id = _get_env("FIREBASE_PROJECT_ID", "demo-project")
     emulator_host = _get_env("FIRESTORE_EMULATOR_HOST")
@@ -45,15 +69,15 @@ def initialize_firebase() -> firebase_admin.App:
 
     # Check for emulator mode FIRST (no credentials needed)
     if emulator_host:
-        _app = firebase_admin.initialize_app(options={"projectId": project_id})
+        app = firebase_admin.initialize_app(options={"projectId": project_id})
         print(f"Firebase Admin initialized for emulator: {emulator_host}")
-        return _app
+        return app
 
     # Production mode - need credentials
     if service_account_path:
         # Use service account file
         cred = credentials.Certificate(service_account_path)
-        _app = firebase_admin.initialize_app(cred, {"projectId": project_id})
+        return firebase_admin.initialize_app(cred, {"projectId": project_id})
     elif project_id and client_email and private_key:
         # Use inline service account credentials
         cred = credentials.Certificate(
@@ -69,35 +93,55 @@ def initialize_firebase() -> firebase_admin.App:
                 "token_uri": "https://oauth2.googleapis.com/token",
             }
         )
-        _app = firebase_admin.initialize_app(cred, {"projectId": project_id})
+        return firebase_admin.initialize_app(cred, {"projectId": project_id})
     elif project_id:
         # Use application default credentials (for Cloud Run, etc.)
-        _app = firebase_admin.initialize_app(
+        return firebase_admin.initialize_app(
             credentials.ApplicationDefault(), {"projectId": project_id}
         )
     else:
         # Fallback to demo project (emulator-like mode)
-        _app = firebase_admin.initialize_app(options={"projectId": "demo-project"})
-
-    return _app
+        return firebase_admin.initialize_app(options={"projectId": "demo-project"})
 
 
 def get_auth() -> auth.Client:
     """Get Firebase Auth client."""
-    initialize_firebase()
+    if _app is None:
+        initialize_firebase()
     return auth
 
 
 def get_firestore() -> firestore.Client:
-    """Get Firestore client."""
+    """Get Firestore client (created once, then reused)."""
+    client = _firestore_client
+    if client is not None:
+        return client
+    return _create_firestore_client()
+
+
+def _create_firestore_client() -> firestore.Client:
+    """Initialize Firebase if needed and cache the Firestore client."""
+    global _firestore_client
     initialize_firebase()
-    return firestore.client()
+    with _init_lock:
+        if _firestore_client is None:
+            _firestore_client = firestore.client()
+        return _firestore_client
+
+
+def get_async_firestore() -> firestore_async.AsyncClient:
+    """Get async Firestore client (non-blocking, for use inside the event loop)."""
+    initialize_firebase()
+    return firestore_async.client()
 
 
 def verify_id_token(token: str) -> dict:
     """
     Verify a Firebase ID token.
 
+    Successful verifications are cached for a few minutes (bounded by the
+    token's exp claim), so repeat requests skip the signature check.
+
     Args:
         token: The Firebase ID token to verify
 
@@ -108,5 +152,56 @@ def verify_id_token(token: str) -> dict:
         firebase_admin.auth.InvalidIdTokenError: If token is invalid
         firebase_admin.auth.ExpiredIdTokenError: If token is expired
     """
-    initialize_firebase()
-    return auth.verify_id_token(token)
+    key = _token_key(token)
+    cached = _cached_claims(key)
+    if cached is not None:
+        return cached
+
+    if _app is None:
+        initialize_firebase()
+    decoded = auth.verify_id_token(token)
+
+    ttl = min(decoded.get("exp", 0) - time.time(), _TOKEN_CACHE_TTL)
+    if ttl > 0:
+        with _token_cache_lock:
+            _token_cache[key] = (time.monotonic() + ttl, decoded)
+            if len(_token_cache) > _TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return dict(decoded)
+
+
+def get_cached_id_token(token: str) -> Optional[dict]:
+    """
+    Get the claims of an already-verified token without verifying it.
+
+    Returns None if the token isn't cached (or its entry has expired);
+    callers then fall back to verify_id_token.
+    """
+    return _cached_claims(_token_key(token))
+
+
+def _token_key(token: str) -> bytes:
+    """Cache key for a token."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _cached_claims(key: bytes) -> Optional[dict]:
+    """Look up cached claims by token digest, expiring stale entries."""
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] > time.monotonic():
+            return dict(entry[1])
+        _token_cache.pop(key, None)
+        return None
+
+
+def clear_token_cache(token: Optional[str] = None) -> None:
+    """Forget a cached token (e.g. after revoking it), or all tokens."""
+    key = None if token is None else _token_key(token)
+    with _token_cache_lock:
+        if key is None:
+            _token_cache.clear()
+        else:
+            _token_cache.pop(key, None)
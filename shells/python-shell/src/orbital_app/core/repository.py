@@ -7,11 +7,282 @@ Supports multiple backends:
 - SQLite (planned)
 - PostgreSQL (planned)
 """
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from abc import ABC, abstractmethod
+import asyncio
+import copy
+import itertools
+import operator
 import uuid
 
-from .firebase import get_firestore
+from firebase_admin import firestore
+from google.api_core.exceptions import NotFound
+
+from .bindings import resolve_binding
+from .firebase import get_async_firestore
+
+
+# S-expression comparison operators -> Firestore where() operators
+_FIRESTORE_OPERATORS = {
+    "=": "==",
+    "==": "==",
+    "!=": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "in": "in",
+    "not-in": "not-in",
+}
+
+# Firestore caps the number of values in an 'in' / 'not-in' filter; larger
+# 'in' lists are split across several queries
+_FIRESTORE_IN_LIMIT = 30
+
+# Firestore caps the number of writes in a single WriteBatch
+_FIRESTORE_BATCH_LIMIT = 500
+
+# A batched write: (action, entity_type, entity_id, data)
+# action is 'create', 'update' or 'delete'; entity_id may be None for create
+WriteOp = Tuple[str, str, Optional[str], Dict[str, Any]]
+
+_COMPARATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, values: value in values,
+    "not-in": lambda value, values: value not in values,
+}
+
+# Compiled filters keyed by repr() of the S-expression
+_FILTER_CACHE_SIZE = 1024
+_filter_cache: Dict[str, "Predicate"] = {}
+_index_lookup_cache: Dict[str, "IndexLookups"] = {}
+_firestore_plan_cache: Dict[str, "FirestorePlan"] = {}
+
+# (entity, context) -> whether the entity matches a filter
+Predicate = Callable[[Dict[str, Any], Dict[str, Any]], bool]
+
+# Indexable equality conjuncts of a filter: (field_name, expected value or binding)
+IndexLookups = Tuple[Tuple[str, Any], ...]
+
+# context -> (pushed Firestore filter or None, residual S-expression or None)
+FirestorePlan = Callable[[Dict[str, Any]], Tuple[Any, Any]]
+
+
+class _FilterUnion(tuple):
+    """Firestore filters run as separate queries, whose results are combined."""
+
+
+def _entity_field(field_path: Any) -> Optional[str]:
+    """Translate "@entity.a.b" into the dotted field path "a.b"."""
+    if isinstance(field_path, str) and field_path.startswith("@entity."):
+        return field_path[len("@entity."):]
+    return None
+
+
+def _match_all(entity: Dict[str, Any], context: Dict[str, Any]) -> bool:
+    """Predicate for filters that don't exclude anything."""
+    return True
+
+
+def _build_predicate(filter_expr: Any) -> Predicate:
+    """
+    Turn an S-expression filter into a predicate over entities.
+
+    Supports and/or/not and the comparison operators in _COMPARATORS.
+    Unrecognized expressions don't exclude anything.
+    """
+    if not filter_expr or not isinstance(filter_expr, list):
+        return _match_all
+
+    op = filter_expr[0]
+
+    if op in ("and", "or"):
+        predicates = tuple(_build_predicate(expr) for expr in filter_expr[1:])
+        combine = all if op == "and" else any
+        return lambda entity, context: combine(p(entity, context) for p in predicates)
+    if op == "not":
+        inner = _build_predicate(filter_expr[1])
+        return lambda entity, context: not inner(entity, context)
+
+    compare = _COMPARATORS.get(op)
+    field_name = _entity_field(filter_expr[1]) if len(filter_expr) > 2 else None
+    if compare is None or field_name is None:
+        return _match_all
+
+    path = tuple(field_name.split("."))
+    # Copy so later changes to the caller's expression can't leak into the cache
+    expected = copy.deepcopy(filter_expr[2])
+    is_binding = isinstance(expected, str) and expected[:1] == "@"
+
+    def predicate(entity: Dict[str, Any], context: Dict[str, Any]) -> bool:
+        value = entity
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        try:
+            return bool(compare(value, resolve_binding(expected, context) if is_binding else expected))
+        except TypeError:
+            # Incomparable types (e.g. None < 1) never match
+            return False
+
+    return predicate
+
+
+def _build_index_lookups(filter_expr: Any) -> IndexLookups:
+    """
+    Find the equality conjuncts of a filter that an index can serve.
+
+    That's the filter itself if it's an equality on a top-level field, or
+    such conjuncts of an and, in order.
+    """
+    if not filter_expr or not isinstance(filter_expr, list):
+        return ()
+    conjuncts = filter_expr[1:] if filter_expr[0] == "and" else [filter_expr]
+    lookups = []
+    for expr in conjuncts:
+        if not isinstance(expr, list) or len(expr) < 3 or expr[0] not in ("=", "=="):
+            continue
+        field_name = _entity_field(expr[1])
+        if field_name is None or "." in field_name:
+            continue
+        lookups.append((field_name, copy.deepcopy(expr[2])))
+    return tuple(lookups)
+
+
+def _combine_filters(composite, filters: List[Any]) -> Any:
+    """Combine Firestore filters with And/Or, unwrapping the single-filter case."""
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return composite(filters=filters)
+
+
+def _build_firestore_plan(filter_expr: Any) -> FirestorePlan:
+    """
+    Translate an S-expression filter into a plan for a Firestore filter.
+
+    The structure is analysed once here; calling the plan only resolves
+    bindings and builds the Firestore filter objects. The first time the
+    plan leaves a residual, a note is printed, once per distinct filter.
+    """
+    # Copy so later changes to the caller's expression can't leak into the cache
+    plan = _plan_firestore_filter(copy.deepcopy(filter_expr))
+    warned = False
+
+    def plan_with_note(context: Dict[str, Any]) -> Tuple[Any, Any]:
+        nonlocal warned
+        pushed, residual = plan(context)
+        if residual is not None and not warned:
+            warned = True
+            print(f"Filter not fully supported by Firestore, applying client-side: {residual}")
+        return pushed, residual
+
+    return plan_with_note
+
+
+def _plan_firestore_filter(filter_expr: Any) -> FirestorePlan:
+    """Build the plan for one (already copied) filter expression."""
+    unsupported = (None, filter_expr)
+    if not isinstance(filter_expr, list) or not filter_expr:
+        return lambda context: unsupported
+
+    op = filter_expr[0]
+
+    if op == "and":
+        conjuncts = tuple(_plan_firestore_filter(expr) for expr in filter_expr[1:])
+
+        def plan_and(context: Dict[str, Any]) -> Tuple[Any, Any]:
+            pushed = []
+            residual = []
+            for plan in conjuncts:
+                expr_pushed, expr_residual = plan(context)
+                if expr_pushed is not None:
+                    pushed.append(expr_pushed)
+                if expr_residual is not None:
+                    residual.append(expr_residual)
+            if len(residual) > 1:
+                residual = [["and", *residual]]
+            residual = residual[0] if residual else None
+            if any(isinstance(p, _FilterUnion) for p in pushed):
+                # One query per combination of the split conjuncts' parts
+                options = [p if isinstance(p, _FilterUnion) else (p,) for p in pushed]
+                return _FilterUnion(
+                    _combine_filters(firestore.And, list(combo))
+                    for combo in itertools.product(*options)
+                ), residual
+            return _combine_filters(firestore.And, pushed), residual
+
+        return plan_and
+
+    if op == "or":
+        disjuncts = tuple(_plan_firestore_filter(expr) for expr in filter_expr[1:])
+
+        def plan_or(context: Dict[str, Any]) -> Tuple[Any, Any]:
+            pushed = []
+            for plan in disjuncts:
+                expr_pushed, expr_residual = plan(context)
+                # A disjunct Firestore can't express means the whole or can't be pushed
+                if expr_pushed is None or expr_residual is not None:
+                    return unsupported
+                pushed.append(expr_pushed)
+            if any(isinstance(p, _FilterUnion) for p in pushed):
+                # Every disjunct becomes its own query
+                return _FilterUnion(
+                    f for p in pushed for f in (p if isinstance(p, _FilterUnion) else (p,))
+                ), None
+            return _combine_filters(firestore.Or, pushed), None
+
+        return plan_or
+
+    firestore_op = _FIRESTORE_OPERATORS.get(op)
+    field_name = _entity_field(filter_expr[1]) if len(filter_expr) > 2 else None
+    if firestore_op is None or field_name is None:
+        return lambda context: unsupported
+
+    expected = filter_expr[2]
+    checks_list = firestore_op in ("in", "not-in")
+
+    def plan_compare(context: Dict[str, Any]) -> Tuple[Any, Any]:
+        value = resolve_binding(expected, context)
+        if checks_list and (not isinstance(value, list) or not value):
+            return unsupported
+        if checks_list and len(value) > _FIRESTORE_IN_LIMIT:
+            # not-in can't be split: Firestore allows only one per query
+            if firestore_op != "in":
+                return unsupported
+            return _FilterUnion(
+                firestore.FieldFilter(field_name, "in", value[start:start + _FIRESTORE_IN_LIMIT])
+                for start in range(0, len(value), _FIRESTORE_IN_LIMIT)
+            ), None
+        return firestore.FieldFilter(field_name, firestore_op, value), None
+
+    if isinstance(expected, str) and expected[:1] == "@":
+        return plan_compare
+    # Literal comparisons translate the same way every time
+    fixed = plan_compare({})
+    return lambda context: fixed
+
+
+def _cached(cache: Dict[str, Any], build: Callable[[Any], Any], filter_expr: Any) -> Any:
+    """Get a compiled form of a filter from cache, building it on first use."""
+    key = repr(filter_expr)
+    compiled = cache.get(key)
+    if compiled is None:
+        if len(cache) >= _FILTER_CACHE_SIZE:
+            cache.clear()
+        compiled = cache[key] = build(filter_expr)
+    return compiled
+
+
+def _compile_filter(filter_expr: Any) -> Predicate:
+    """Get the compiled predicate for a filter, compiling it on first use."""
+    return _cached(_filter_cache, _build_predicate, filter_expr)
 
 
 class Repository(ABC):
@@ -46,19 +317,62 @@ class Repository(ABC):
 
     @abstractmethod
     async def delete(self, entity_type: str, entity_id: str) -> bool:
-        """Delete an entity."""
+        """Delete an entity, returning False if it didn't exist."""
         pass
 
+    async def bulk_create(
+        self, entity_type: str, items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several entities of one type, returning them in order.
+
+        Goes through batch_write, so backends that batch writes create them
+        in one round trip.
+        """
+        return await self.batch_write(
+            [("create", entity_type, None, data) for data in items]
+        )
+
+    async def batch_write(self, ops: List[WriteOp]) -> List[Any]:
+        """
+        Apply several writes, returning one result per op.
+
+        Results match the single-op methods: the entity dict for create and
+        update, a bool for delete. Backends that support it override this
+        to send the writes in one round trip.
+        """
+        results = []
+        for action, entity_type, entity_id, data in ops:
+            if action == "create":
+                results.append(await self.create(entity_type, data))
+            elif action == "update":
+                results.append(await self.update(entity_type, entity_id, data))
+            elif action == "delete":
+                results.append(await self.delete(entity_type, entity_id))
+            else:
+                results.append(None)
+        return results
+
 
 class InMemoryRepository(Repository):
-    """In-memory repository for testing and development."""
+    """
+    In-memory repository for testing and development.
+
+    Equality filters on top-level fields are served from per-field indexes,
+    built the first time a field is filtered on and kept up to date by the
+    write methods. Entities are copied on the way in and out, so the stored
+    dicts only change through those methods and the indexes can't go stale.
+    """
 
     def __init__(self):
         self._store: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # entity_type -> field -> value -> ids (dict used as an ordered set)
+        self._indexes: Dict[str, Dict[str, Dict[Any, Dict[str, None]]]] = {}
 
     async def get(self, entity_type: str, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get a single entity by ID."""
-        return self._store.get(entity_type, {}).get(entity_id)
+        entity = self._store.get(entity_type, {}).get(entity_id)
+        return None if entity is None else dict(entity)
 
     async def list(
         self,
@@ -67,87 +381,172 @@ class InMemoryRepository(Repository):
         context: Dict[str, Any] = None,
     ) -> List[Dict[str, Any]]:
         """List entities with optional filtering."""
-        entities = list(self._store.get(entity_type, {}).values())
-
-        # Apply simple filter if provided
+        # Apply filter if provided
         if filter_expr and context:
-            entities = self._apply_filter(entities, filter_expr, context)
+            return self._apply_filter(entity_type, filter_expr, context)
 
-        return entities
+        return [dict(e) for e in self._store.get(entity_type, {}).values()]
 
     async def create(self, entity_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new entity."""
         entity_id = data.get("id") or str(uuid.uuid4())
         data = {**data, "id": entity_id}
+        self._put(entity_type, data)
+        return dict(data)
 
-        if entity_type not in self._store:
-            self._store[entity_type] = {}
-        self._store[entity_type][entity_id] = data
-
-        return data
+    async def bulk_create(
+        self, entity_type: str, items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Create several entities of one type in a single call."""
+        created = []
+        for data in items:
+            data = {**data, "id": data.get("id") or str(uuid.uuid4())}
+            self._put(entity_type, data)
+            created.append(dict(data))
+        return created
 
     async def update(
         self, entity_type: str, entity_id: str, data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Update an existing entity (upsert - creates if not exists)."""
-        if entity_type not in self._store:
-            self._store[entity_type] = {}
+        entities = self._store.setdefault(entity_type, {})
 
-        if entity_id in self._store[entity_type]:
+        if entity_id in entities:
             # Update existing
-            self._store[entity_type][entity_id].update(data)
+            entity = entities[entity_id]
+            self._index(entity_type, entity, add=False)
+            entity.update(data)
+            self._index(entity_type, entity, add=True)
         else:
             # Create new (upsert)
-            self._store[entity_type][entity_id] = {**data, "id": entity_id}
+            self._put(entity_type, {**data, "id": entity_id})
 
-        return self._store[entity_type][entity_id]
+        return dict(entities[entity_id])
 
     async def delete(self, entity_type: str, entity_id: str) -> bool:
         """Delete an entity."""
-        if entity_type in self._store and entity_id in self._store[entity_type]:
-            del self._store[entity_type][entity_id]
+        entities = self._store.get(entity_type)
+        if entities is not None and entity_id in entities:
+            self._index(entity_type, entities.pop(entity_id), add=False)
             return True
         return False
 
+    def _put(self, entity_type: str, entity: Dict[str, Any]) -> None:
+        """Store an entity (replacing any with the same id) and index it."""
+        entities = self._store.setdefault(entity_type, {})
+        existing = entities.get(entity["id"])
+        if existing is not None:
+            self._index(entity_type, existing, add=False)
+        entities[entity["id"]] = entity
+        self._index(entity_type, entity, add=True)
+
+    def _index(self, entity_type: str, entity: Dict[str, Any], add: bool) -> None:
+        """Add an entity to, or remove it from, the indexes for its type."""
+        for field_name, index in self._indexes.get(entity_type, {}).items():
+            if add:
+                self._index_one(index, field_name, entity)
+                continue
+            try:
+                ids = index.get(entity.get(field_name))
+            except TypeError:
+                continue
+            if ids is not None:
+                ids.pop(entity["id"], None)
+
+    @staticmethod
+    def _index_one(index: Dict[Any, Dict[str, None]], field_name: str, entity: Dict[str, Any]) -> None:
+        """Add a single entity to one field index."""
+        try:
+            index.setdefault(entity.get(field_name), {})[entity["id"]] = None
+        except TypeError:
+            # Unhashable values aren't indexed; they never equal a hashable key
+            pass
+
+    def _indexed_ids(
+        self, entity_type: str, filter_expr: Any, context: Dict[str, Any]
+    ) -> Optional[List[str]]:
+        """
+        Candidate ids for a filter from an equality index, or None to scan.
+
+        Uses the filter itself if it's an equality on a top-level field, or
+        the most selective such conjunct of an and (the smallest bucket).
+        Every conjunct must hold, so an empty bucket means no matches. This
+        relies on the indexes being exact, which the copies made by the
+        read and write methods guarantee.
+        """
+        best: Optional[Dict[str, None]] = None
+        for field_name, expected in _cached(_index_lookup_cache, _build_index_lookups, filter_expr):
+            value = resolve_binding(expected, context)
+            try:
+                hash(value)
+            except TypeError:
+                continue
+
+            indexes = self._indexes.setdefault(entity_type, {})
+            index = indexes.get(field_name)
+            if index is None:
+                # Build the index from the current entities on first use
+                index = indexes[field_name] = {}
+                for entity in self._store.get(entity_type, {}).values():
+                    self._index_one(index, field_name, entity)
+            ids = index.get(value, {})
+            if best is None or len(ids) < len(best):
+                best = ids
+                if not best:
+                    break
+
+        return None if best is None else list(best)
+
     def _apply_filter(
         self,
-        entities: List[Dict[str, Any]],
+        entity_type: str,
         filter_expr: Any,
         context: Dict[str, Any],
     ) -> List[Dict[str, Any]]:
-        """Apply a simple S-expression filter."""
+        """Apply an S-expression filter, using an index when possible."""
+        entities = self._store.get(entity_type, {})
         if not filter_expr or not isinstance(filter_expr, list):
-            return entities
+            return [dict(e) for e in entities.values()]
 
-        op = filter_expr[0]
-
-        if op == "=":
-            field_path = filter_expr[1]
-            expected_value = filter_expr[2]
-
-            # Resolve field path (e.g., "@entity.status")
-            if isinstance(field_path, str) and field_path.startswith("@entity."):
-                field_name = field_path.replace("@entity.", "")
-                return [e for e in entities if e.get(field_name) == expected_value]
-
-        return entities
+        matches = _compile_filter(filter_expr)
+        ids = self._indexed_ids(entity_type, filter_expr, context)
+        if ids is None:
+            candidates = entities.values()
+        else:
+            candidates = [entities[i] for i in ids if i in entities]
+        # The index only narrows the candidates; the full filter decides
+        return [dict(e) for e in candidates if matches(e, context)]
 
     def seed(self, entity_type: str, entities: List[Dict[str, Any]]):
         """Seed the repository with test data."""
-        if entity_type not in self._store:
-            self._store[entity_type] = {}
+        self._store.setdefault(entity_type, {})
         for entity in entities:
             entity_id = entity.get("id") or str(uuid.uuid4())
             entity["id"] = entity_id
-            self._store[entity_type][entity_id] = entity
+            self._put(entity_type, dict(entity))
+
+    def clear(self, entity_type: Optional[str] = None) -> None:
+        """
+        Remove stored entities and their indexes.
+
+        Args:
+            entity_type: If provided, only clear entities of this type.
+                         If None, clear everything.
+        """
+        if entity_type:
+            self._store.pop(entity_type, None)
+            self._indexes.pop(entity_type, None)
+        else:
+            self._store.clear()
+            self._indexes.clear()
 
 
 class FirestoreRepository(Repository):
     """
     Firestore repository for production use.
 
-    Uses Firebase Admin SDK to interact with Cloud Firestore.
-    Entity types map to Firestore collections.
+    Uses the Firebase Admin SDK's async client so Firestore calls don't
+    block the event loop. Entity types map to Firestore collections.
     """
 
     def __init__(self):
@@ -155,15 +554,15 @@ class FirestoreRepository(Repository):
 
     @property
     def db(self):
-        """Lazy-load Firestore client."""
+        """Lazy-load async Firestore client."""
         if self._db is None:
-            self._db = get_firestore()
+            self._db = get_async_firestore()
         return self._db
 
     async def get(self, entity_type: str, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get a single entity by ID from Firestore."""
         doc_ref = self.db.collection(entity_type).document(entity_id)
-        doc = doc_ref.get()
+        doc = await doc_ref.get()
 
         if doc.exists:
             data = doc.to_dict()
@@ -178,19 +577,34 @@ class FirestoreRepository(Repository):
         context: Dict[str, Any] = None,
     ) -> List[Dict[str, Any]]:
         """List entities from Firestore with optional filtering."""
-        collection_ref = self.db.collection(entity_type)
+        queries = [self.db.collection(entity_type)]
+        residual = None
 
-        # Apply S-expression filter if provided
+        # Push as much of the S-expression filter as possible into the query
         if filter_expr and context:
-            collection_ref = self._apply_filter(collection_ref, filter_expr, context)
+            queries, residual = self._apply_filter(queries[0], filter_expr, context)
 
-        docs = collection_ref.stream()
+        if len(queries) == 1:
+            entities = await self._read(queries[0])
+        else:
+            # Split queries run concurrently; a document matched by several
+            # of them is kept once, in first-seen order
+            results = await asyncio.gather(*(self._read(query) for query in queries))
+            entities = list({e["id"]: e for batch in results for e in batch}.values())
+
+        if residual is None:
+            return entities
+        matches = _compile_filter(residual)
+        return [e for e in entities if matches(e, context)]
+
+    @staticmethod
+    async def _read(query) -> List[Dict[str, Any]]:
+        """Stream a query's documents as entity dicts."""
         entities = []
-        for doc in docs:
+        async for doc in query.stream():
             data = doc.to_dict()
             data["id"] = doc.id
             entities.append(data)
-
         return entities
 
     async def create(self, entity_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -201,57 +615,116 @@ class FirestoreRepository(Repository):
         doc_data = {k: v for k, v in data.items() if k != "id"}
 
         doc_ref = self.db.collection(entity_type).document(entity_id)
-        doc_ref.set(doc_data)
+        await doc_ref.set(doc_data)
 
         return {**doc_data, "id": entity_id}
 
     async def update(
         self, entity_type: str, entity_id: str, data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Update an existing entity in Firestore."""
+        """
+        Update an existing entity in Firestore.
+
+        Returns the written fields plus id rather than reading the whole
+        document back, saving a round trip.
+        """
         # Remove id from update data
         update_data = {k: v for k, v in data.items() if k != "id"}
 
         doc_ref = self.db.collection(entity_type).document(entity_id)
-        doc_ref.update(update_data)
-
-        # Return the updated document
-        updated_doc = doc_ref.get()
-        if updated_doc.exists:
-            result = updated_doc.to_dict()
-            result["id"] = updated_doc.id
-            return result
+        await doc_ref.update(update_data)
+
         return {**update_data, "id": entity_id}
 
     async def delete(self, entity_type: str, entity_id: str) -> bool:
-        """Delete an entity from Firestore."""
+        """
+        Delete an entity from Firestore, returning False if it didn't exist.
+
+        An exists precondition on the delete tells a missing document apart
+        without reading it first.
+        """
         doc_ref = self.db.collection(entity_type).document(entity_id)
+        try:
+            await doc_ref.delete(option=self.db.write_option(exists=True))
+        except NotFound:
+            return False
+        return True
 
-        # Check if document exists before deleting
-        if doc_ref.get().exists:
-            doc_ref.delete()
-            return True
-        return False
+    async def batch_write(self, ops: List[WriteOp]) -> List[Any]:
+        """
+        Apply several writes using Firestore WriteBatches.
+
+        Writes are committed in chunks of up to 500 (each chunk is atomic).
+        Updates are strict like update(): a missing document makes its whole
+        chunk fail with NotFound, and none of that chunk's writes are applied.
+        Update results match update(): written fields plus id. Deletes of missing documents are no-ops here, so
+        every delete reports True; use delete() to find out whether the
+        document existed.
+        """
+        results: List[Any] = [None] * len(ops)
+
+        for start in range(0, len(ops), _FIRESTORE_BATCH_LIMIT):
+            batch = self.db.batch()
+            for index in range(start, min(start + _FIRESTORE_BATCH_LIMIT, len(ops))):
+                action, entity_type, entity_id, data = ops[index]
+                doc_data = {k: v for k, v in (data or {}).items() if k != "id"}
+
+                if action == "create":
+                    entity_id = (data or {}).get("id") or str(uuid.uuid4())
+                    doc_ref = self.db.collection(entity_type).document(entity_id)
+                    batch.set(doc_ref, doc_data)
+                    results[index] = {**doc_data, "id": entity_id}
+                elif action == "update":
+                    doc_ref = self.db.collection(entity_type).document(entity_id)
+                    batch.update(doc_ref, doc_data)
+                    results[index] = {**doc_data, "id": entity_id}
+                elif action == "delete":
+                    doc_ref = self.db.collection(entity_type).document(entity_id)
+                    batch.delete(doc_ref)
+                    results[index] = True
+            await batch.commit()
+
+        return results
 
-    def _apply_filter(self, collection_ref, filter_expr: Any, context: Dict[str, Any]):
+    def _apply_filter(
+        self, collection_ref, filter_expr: Any, context: Dict[str, Any]
+    ) -> Tuple[Any, Any]:
         """
         Apply S-expression filter to Firestore query.
 
-        Supports basic equality filters like:
-        (= @entity.status "active")
+        Supports comparisons (=, !=, <, <=, >, >=, in, not-in) on @entity
+        fields combined with and/or, e.g.:
+        (and (= @entity.status "active") (>= @entity.priority @payload.min))
+
+        'in' lists longer than Firestore allows are split into one query
+        per chunk of values.
+
+        Returns:
+            Tuple of (queries, residual) where the results of the queries
+            are combined, and residual is the part of the filter Firestore
+            can't express, to be applied client-side (None if the whole
+            filter was pushed down)
         """
         if not filter_expr or not isinstance(filter_expr, list):
-            return collection_ref
+            return [collection_ref], None
 
-        op = filter_expr[0]
+        pushed, residual = self._build_filter(filter_expr, context)
+        if isinstance(pushed, _FilterUnion):
+            return [collection_ref.where(filter=f) for f in pushed], residual
+        if pushed is not None:
+            collection_ref = collection_ref.where(filter=pushed)
+        return [collection_ref], residual
 
-        if op == "=":
-            field_path = filter_expr[1]
-            expected_value = filter_expr[2]
+    def _build_filter(self, filter_expr: Any, context: Dict[str, Any]) -> Tuple[Any, Any]:
+        """
+        Translate an S-expression filter into a Firestore filter.
 
-            # Resolve field path (e.g., "@entity.status" -> "status")
-            if isinstance(field_path, str) and field_path.startswith("@entity."):
-                field_name = field_path.replace("@entity.", "")
-                return collection_ref.where(field_name, "==", expected_value)
+        The translation is compiled once per distinct filter and reused.
 
-        return collection_ref
+        Returns:
+            Tuple of (pushed, residual) - the Firestore filter (None if
+            nothing could be pushed, or a _FilterUnion of filters to run as
+            separate queries) and the remaining S-expression to evaluate
+            client-side (or None)
+        """
+        return _cached(_firestore_plan_cache, _build_firestore_plan, filter_expr)(context)
@@ -0,0 +1,109 @@
+"""
+Serialization - Fast JSON encoding for responses and broadcasts.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+Values that neither encoder understands natively (Firestore GeoPoint,
+document references and nanosecond timestamps, PyTorch tensors and
+modules, numpy values) are converted by json_default.
+
+MessagePack encoding (packb) is available when msgpack is installed, for
+WebSocket clients that negotiate it.
+"""
+from datetime import date, datetime
+from typing import Any
+import json
+import sys
+
+from fastapi.responses import JSONResponse
+from google.cloud.firestore_v1 import GeoPoint
+from google.cloud.firestore_v1.base_document import BaseDocumentReference
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+if orjson is not None:
+    # Match the stdlib encoder: non-string keys are allowed; numpy is native
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def tensor_to_python(obj: Any) -> Any:
+    """Convert a tensor to a Python list or scalar."""
+    if obj.dim() == 0:
+        return obj.item()
+    return obj.tolist()
+
+
+def module_to_python(obj: Any) -> str:
+    """Represent a neural network module by its class name."""
+    return f"<{obj.__class__.__name__}>"
+
+
+def json_default(obj: Any) -> Any:
+    """Convert a value the JSON encoder can't handle natively."""
+    # Firestore returns timestamps as datetime subclasses, which orjson rejects
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, GeoPoint):
+        return {"latitude": obj.latitude, "longitude": obj.longitude}
+    if isinstance(obj, BaseDocumentReference):
+        return obj.path
+
+    # Only modules that are already loaded can own obj's type
+    torch = sys.modules.get("torch")
+    np = sys.modules.get("numpy")
+    if torch is not None:
+        if isinstance(obj, torch.Tensor):
+            if orjson is not None and np is not None and obj.dim() > 0:
+                # orjson writes numpy arrays natively: no per-element boxing
+                # (GPU tensors are copied to the host once first). Dtypes it
+                # can't write come back here as arrays (below)
+                try:
+                    return obj.detach().cpu().numpy()
+                except (RuntimeError, TypeError):
+                    pass
+            return tensor_to_python(obj)
+        if isinstance(obj, torch.nn.Module):
+            return module_to_python(obj)
+    if np is not None and isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        obj, default=json_default, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with dumps (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _packb_default(obj: Any) -> Any:
+    """json_default for msgpack, which can't write numpy arrays."""
+    value = json_default(obj)
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def packb(obj: Any) -> bytes:
+    """Encode obj as MessagePack; requires msgpack (see HAS_MSGPACK)."""
+    return msgpack.packb(obj, default=_packb_default)
+
+
+HAS_MSGPACK = msgpack is not None
@@ -3,8 +3,8 @@ Application Settings - Environment configuration using pydantic-settings.
 
 Loads configuration from environment variables and .env files.
 """
-from typing import List, Optional
-from functools import lru_cache
+from typing import Optional, Tuple
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     # Server Configuration
     port: int = 8000
     environment: str = "development"
+    # Threads available to sync endpoints/dependencies (anyio default is 40)
+    thread_limit: int = 200
 
     # Firebase Configuration
     firebase_project_id: Optional[str] = None
@@ -43,22 +45,25 @@ class Settings(BaseSettings):
     youtube_api_key: Optional[str] = None
     stripe_secret_key: Optional[str] = None
 
-    @property
-    def cors_origins_list(self) -> List[str]:
+    # Derived values are computed on first access and then cached on the
+    # instance; get_settings() keeps a single instance for the process.
+
+    @cached_property
+    def cors_origins_list(self) -> Tuple[str, ...]:
         """Parse CORS origins from comma-separated string."""
-        return [origin.strip() for origin in self.cors_origins.split(",")]
+        return tuple(origin.strip() for origin in self.cors_origins.split(","))
 
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production mode."""
         return self.environment.lower() == "production"
 
-    @property
+    @cached_property
     def is_development(self) -> bool:
         """Check if running in development mode."""
         return self.environment.lower() == "development"
 
-    @property
+    @cached_property
     def is_emulator(self) -> bool:
         """Check if using Firebase emulator."""
         return bool(self.firestore_emulator_host)
@@ -5,53 +5,147 @@ Manages WebSocket connections for real-time updates across the application.
 Supports broadcasting client effects to connected frontends.
 """
 from fastapi import WebSocket
-from typing import Dict, List, Any, Optional
-import json
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Set, Tuple
 import asyncio
+import sys
+
+from .serialization import HAS_MSGPACK, dumps, module_to_python, packb, tensor_to_python
+
+
+def _find_converter(cls: type) -> Optional[Callable[[Any], Any]]:
+    """
+    Pick the converter for a type, or None if values pass through unchanged.
+
+    PyTorch and numpy are looked up in sys.modules rather than imported: if
+    they haven't been imported, no value can be one of their types.
+    """
+    if issubclass(cls, dict):
+        return lambda obj: {k: make_json_serializable(v) for k, v in obj.items()}
+    if issubclass(cls, (list, tuple)):
+        return lambda obj: [make_json_serializable(item) for item in obj]
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        if issubclass(cls, torch.nn.Module):
+            return module_to_python
+        if issubclass(cls, torch.Tensor):
+            return tensor_to_python
+
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if issubclass(cls, np.ndarray):
+            return np.ndarray.tolist
+        if issubclass(cls, (np.int64, np.int32, np.float64, np.float32)):
+            return lambda obj: obj.item()
+
+    return None
+
+
+# Exact type -> converter (None for types that are already serializable)
+_converters: Dict[type, Optional[Callable[[Any], Any]]] = {}
 
 
 def make_json_serializable(obj: Any) -> Any:
     """Convert PyTorch tensors and other non-serializable types to JSON-serializable Python types."""
-    # Handle PyTorch types
+    cls = type(obj)
     try:
-        import torch
-        import torch.nn as nn
-        # Handle nn.Module (neural network modules) - convert to string representation
-        if isinstance(obj, nn.Module):
-            return f"<{obj.__class__.__name__}>"
-        # Handle tensors
-        if isinstance(obj, torch.Tensor):
-            # Convert tensor to Python list or scalar
-            if obj.dim() == 0:
-                return obj.item()
-            return obj.tolist()
-    except ImportError:
-        pass
-
-    # Handle numpy arrays
-    try:
-        import numpy as np
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, (np.int64, np.int32, np.float64, np.float32)):
-            return obj.item()
-    except ImportError:
-        pass
+        convert = _converters[cls]
+    except KeyError:
+        convert = _converters[cls] = _find_converter(cls)
+    return obj if convert is None else convert(obj)
+
+
+# Messages buffered per connection before a slow client is dropped
+_SEND_QUEUE_SIZE = 64
+
+# Close code sent to clients dropped for falling behind ("Try Again Later")
+_CLOSE_TOO_SLOW = 1013
+
+# Wire formats: JSON in text frames, JSON in binary frames, MessagePack
+_TEXT = "text"
+_JSON = "json"
+_MSGPACK = "msgpack"
+
+# WebSocket subprotocol a client requests to receive MessagePack frames
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+# Accept header value that requests MessagePack frames, for clients that
+# can't set a subprotocol
+MSGPACK_MEDIA_TYPE = b"application/x-msgpack"
+
+
+def _accepts_msgpack(scope: Dict[str, Any]) -> bool:
+    """Whether the handshake's Accept header asks for MessagePack."""
+    return any(
+        name == b"accept" and MSGPACK_MEDIA_TYPE in value.lower()
+        for name, value in scope.get("headers", ())
+    )
 
-    # Handle dictionaries recursively
-    if isinstance(obj, dict):
-        return {k: make_json_serializable(v) for k, v in obj.items()}
+# Connections a broadcast enqueues to before yielding to the event loop
+BROADCAST_BATCH_SIZE = 50
 
-    # Handle lists recursively
-    if isinstance(obj, list):
-        return [make_json_serializable(item) for item in obj]
+# schedule_client_effects sends a batch after this many seconds, or sooner
+# once it holds _BATCH_MAX messages
+_BATCH_DELAY = 0.005
+_BATCH_MAX = 50
 
-    # Handle tuples
-    if isinstance(obj, tuple):
-        return [make_json_serializable(item) for item in obj]
 
-    # Return as-is for other types
-    return obj
+class _Frames:
+    """A message, encoded at most once per wire format however many connections use it."""
+
+    __slots__ = ("message", "_encoded")
+
+    def __init__(self, message: Dict[str, Any]):
+        self.message = message
+        self._encoded: Dict[str, Any] = {}
+
+    def get(self, wire_format: str) -> Any:
+        """Return the frame for a wire format, encoding it on first use."""
+        frame = self._encoded.get(wire_format)
+        if frame is None:
+            if wire_format == _MSGPACK:
+                frame = packb(self.message)
+            elif wire_format == _TEXT:
+                frame = self.get(_JSON).decode("utf-8")
+            else:
+                frame = dumps(self.message)
+            self._encoded[wire_format] = frame
+        return frame
+
+
+class _ConnectionWriter:
+    """
+    Sends one connection's messages, in order, from a dedicated task.
+
+    Broadcasts only enqueue, so a slow client can't stall the broadcaster;
+    the queue is bounded so it can't buffer without limit either.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        wire_format: str,
+        on_error: Callable[[WebSocket], Awaitable[None]],
+    ):
+        self.websocket = websocket
+        self.wire_format = wire_format
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=_SEND_QUEUE_SIZE)
+        self.task = asyncio.create_task(self._run(on_error))
+
+    async def _run(self, on_error: Callable[[WebSocket], Awaitable[None]]) -> None:
+        send = self.websocket.send_text if self.wire_format == _TEXT else self.websocket.send_bytes
+        while True:
+            message = await self.queue.get()
+            try:
+                await send(message)
+            except Exception:
+                await on_error(self.websocket)
+                return
+
+    def stop(self) -> None:
+        """Stop sending; queued messages are discarded."""
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
 
 
 class ConnectionManager:
@@ -61,15 +155,26 @@ class ConnectionManager:
         # Map of entity_type -> entity_id -> list of connections
         self.active_connections: Dict[str, Dict[str, List[WebSocket]]] = {}
         # Global connections (receive all updates)
-        self.global_connections: List[WebSocket] = []
+        self.global_connections: Set[WebSocket] = set()
+        # Reverse index: connection -> the (entity_type, entity_id) it's subscribed to
+        self._subscriptions: Dict[WebSocket, List[Tuple[str, str]]] = {}
+        # Per-connection send queues
+        self._writers: Dict[WebSocket, _ConnectionWriter] = {}
+        # (entity_type, entity_id) -> (queued client_effects messages, flush timer)
+        self._pending: Dict[Tuple[str, str], Tuple[List[Dict[str, Any]], asyncio.TimerHandle]] = {}
+        # Fire-and-forget tasks (batch flushes, closes), kept referenced until done
+        self._background: Set["asyncio.Task[None]"] = set()
         # Lock for thread-safe operations
         self._lock = asyncio.Lock()
+        # Keeps broadcasts in order while a large one yields mid-dispatch
+        self._dispatch_lock = asyncio.Lock()
 
     async def connect(
         self,
         websocket: WebSocket,
         entity_type: Optional[str] = None,
         entity_id: Optional[str] = None,
+        binary: bool = False,
     ):
         """Accept a new WebSocket connection.
 
@@ -77,10 +182,29 @@ class ConnectionManager:
             websocket: The WebSocket connection
             entity_type: Optional entity type to subscribe to
             entity_id: Optional entity ID to subscribe to
+            binary: Send messages as binary frames (UTF-8 JSON) rather than
+                text, saving a per-connection re-encode on broadcast
+
+        Clients that request the "msgpack" subprotocol, or send
+        "Accept: application/x-msgpack", are sent MessagePack binary frames
+        instead, when msgpack is installed.
         """
-        await websocket.accept()
+        scope = websocket.scope
+        if HAS_MSGPACK and MSGPACK_SUBPROTOCOL in scope.get("subprotocols", ()):
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+            wire_format = _MSGPACK
+        elif HAS_MSGPACK and _accepts_msgpack(scope):
+            await websocket.accept()
+            wire_format = _MSGPACK
+        else:
+            await websocket.accept()
+            wire_format = _JSON if binary else _TEXT
 
         async with self._lock:
+            if websocket not in self._writers:
+                self._writers[websocket] = _ConnectionWriter(
+                    websocket, wire_format, self._connection_failed
+                )
             if entity_type and entity_id:
                 # Subscribe to specific entity
                 if entity_type not in self.active_connections:
@@ -88,9 +212,10 @@ class ConnectionManager:
                 if entity_id not in self.active_connections[entity_type]:
                     self.active_connections[entity_type][entity_id] = []
                 self.active_connections[entity_type][entity_id].append(websocket)
+                self._subscriptions.setdefault(websocket, []).append((entity_type, entity_id))
             else:
                 # Global subscription
-                self.global_connections.append(websocket)
+                self.global_connections.add(websocket)
 
     async def disconnect(
         self,
@@ -101,21 +226,35 @@ class ConnectionManager:
         """Remove a WebSocket connection."""
         async with self._lock:
             if entity_type and entity_id:
-                if (
-                    entity_type in self.active_connections
-                    and entity_id in self.active_connections[entity_type]
-                ):
-                    connections = self.active_connections[entity_type][entity_id]
-                    if websocket in connections:
-                        connections.remove(websocket)
-                    # Clean up empty lists
-                    if not connections:
-                        del self.active_connections[entity_type][entity_id]
-                    if not self.active_connections[entity_type]:
-                        del self.active_connections[entity_type]
+                subscriptions = self._subscriptions.get(websocket)
+                if subscriptions and (entity_type, entity_id) in subscriptions:
+                    subscriptions.remove((entity_type, entity_id))
+                    if not subscriptions:
+                        del self._subscriptions[websocket]
+                self._unsubscribe(websocket, entity_type, entity_id)
             else:
-                if websocket in self.global_connections:
-                    self.global_connections.remove(websocket)
+                self.global_connections.discard(websocket)
+            # The send queue is shared by every subscription on the socket
+            if websocket not in self._subscriptions and websocket not in self.global_connections:
+                writer = self._writers.pop(websocket, None)
+                if writer is not None:
+                    writer.stop()
+
+    def _unsubscribe(self, websocket: WebSocket, entity_type: str, entity_id: str) -> None:
+        """Remove a connection from one entity's subscribers (call under _lock)."""
+        entities = self.active_connections.get(entity_type)
+        if entities is None or entity_id not in entities:
+            return
+        connections = entities[entity_id]
+        try:
+            connections.remove(websocket)
+        except ValueError:
+            pass
+        # Clean up empty lists
+        if not connections:
+            del entities[entity_id]
+        if not entities:
+            del self.active_connections[entity_type]
 
     async def broadcast_to_entity(
         self,
@@ -124,6 +263,8 @@ class ConnectionManager:
         message: Dict[str, Any],
     ):
         """Broadcast a message to all connections subscribed to an entity."""
+        # Encoded at most once per wire format, shared by every subscriber
+        payload = self._encode(message)
         connections_to_notify: List[WebSocket] = []
 
         async with self._lock:
@@ -139,14 +280,15 @@ class ConnectionManager:
             connections_to_notify.extend(self.global_connections)
 
         # Send to all connections outside the lock
-        await self._send_to_connections(connections_to_notify, message)
+        await self._dispatch(connections_to_notify, payload)
 
     async def broadcast_global(self, message: Dict[str, Any]):
         """Broadcast a message to all global connections."""
+        payload = self._encode(message)
         async with self._lock:
             connections = list(self.global_connections)
 
-        await self._send_to_connections(connections, message)
+        await self._dispatch(connections, payload)
 
     async def broadcast_client_effects(
         self,
@@ -160,7 +302,69 @@ class ConnectionManager:
 
         This is the main method called after processing an event.
         """
-        message = {
+        message = self._client_effects_message(
+            entity_type, entity_id, event, client_effects, data
+        )
+        await self.broadcast_to_entity(entity_type, entity_id, message)
+
+    def schedule_client_effects(
+        self,
+        entity_type: str,
+        entity_id: str,
+        event: str,
+        client_effects: List[Any],
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue client effects to be broadcast together with others for the entity.
+
+        For high-rate producers (e.g. per-epoch training updates). Messages
+        for the same entity within a few milliseconds are sent as one
+        {"type": "client_effects_batch", "items": [...]} message, where each
+        item is what broadcast_client_effects would have sent. A lone message
+        is sent unbatched. Must be called from the event loop.
+        """
+        key = (entity_type, entity_id)
+        message = self._client_effects_message(
+            entity_type, entity_id, event, client_effects, data
+        )
+        pending = self._pending.get(key)
+        if pending is None:
+            timer = asyncio.get_running_loop().call_later(_BATCH_DELAY, self._flush, key)
+            pending = self._pending[key] = ([], timer)
+        pending[0].append(message)
+        if len(pending[0]) >= _BATCH_MAX:
+            self._flush(key)
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        """Broadcast the messages queued for an entity."""
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        messages, timer = pending
+        timer.cancel()
+
+        entity_type, entity_id = key
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = {
+                "type": "client_effects_batch",
+                "entityType": entity_type,
+                "entityId": entity_id,
+                "items": messages,
+            }
+        self._spawn(self.broadcast_to_entity(entity_type, entity_id, message))
+
+    @staticmethod
+    def _client_effects_message(
+        entity_type: str,
+        entity_id: str,
+        event: str,
+        client_effects: List[Any],
+        data: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Build the message sent for an event's client effects."""
+        return {
             "type": "client_effects",
             "entityType": entity_type,
             "entityId": entity_id,
@@ -168,34 +372,84 @@ class ConnectionManager:
             "effects": client_effects,
             "data": data or {},
         }
-        await self.broadcast_to_entity(entity_type, entity_id, message)
 
-    async def _send_to_connections(
-        self, connections: List[WebSocket], message: Dict[str, Any]
-    ):
-        """Send a message to multiple connections, handling failures."""
-        # Convert any PyTorch tensors or numpy arrays to JSON-serializable types
-        serializable_message = make_json_serializable(message)
-        json_message = json.dumps(serializable_message)
-        disconnected: List[WebSocket] = []
+    @staticmethod
+    def _encode(message: Dict[str, Any]) -> _Frames:
+        """Wrap a message so each wire format is encoded once for all its recipients.
+
+        Tensors and numpy arrays are converted by json_default.
+        """
+        return _Frames(message)
+
+    async def _dispatch(self, connections: List[WebSocket], payload: _Frames):
+        """
+        Queue an encoded message for multiple connections.
+
+        No per-connection work beyond the enqueue: connections using the same
+        wire format share one frame. Large fan-outs yield to the event loop
+        every BROADCAST_BATCH_SIZE connections; broadcasts still reach each
+        connection in the order they were made. Connections whose queue is
+        full are too far behind and are dropped.
+        """
+        overflowed: List[WebSocket] = []
 
-        for connection in connections:
+        async with self._dispatch_lock:
+            for start in range(0, len(connections), BROADCAST_BATCH_SIZE):
+                if start:
+                    await asyncio.sleep(0)
+                for connection in connections[start:start + BROADCAST_BATCH_SIZE]:
+                    writer = self._writers.get(connection)
+                    if writer is None:
+                        continue
+                    try:
+                        writer.queue.put_nowait(payload.get(writer.wire_format))
+                    except asyncio.QueueFull:
+                        overflowed.append(connection)
+
+        if overflowed:
+            await self._remove_connections(overflowed)
+            for ws in overflowed:
+                self._close_later(ws, _CLOSE_TOO_SLOW)
+
+    async def _connection_failed(self, websocket: WebSocket) -> None:
+        """Drop a connection whose send raised."""
+        await self._remove_connections([websocket])
+
+    async def _remove_connections(self, disconnected: List[WebSocket]) -> None:
+        """Remove dead connections from every subscription."""
+        # Usually a connection's writer fails after disconnect() already
+        # removed it; skip the lock when there is nothing left to do
+        disconnected = [
+            ws for ws in disconnected
+            if ws in self._writers or ws in self._subscriptions or ws in self.global_connections
+        ]
+        if not disconnected:
+            return
+        async with self._lock:
+            for ws in disconnected:
+                writer = self._writers.pop(ws, None)
+                if writer is not None:
+                    writer.stop()
+                self.global_connections.discard(ws)
+                for entity_type, entity_id in self._subscriptions.pop(ws, ()):
+                    self._unsubscribe(ws, entity_type, entity_id)
+
+    def _close_later(self, websocket: WebSocket, code: int) -> None:
+        """Close a connection in the background so the caller doesn't wait on it."""
+
+        async def close() -> None:
             try:
-                await connection.send_text(json_message)
+                await websocket.close(code=code)
             except Exception:
-                disconnected.append(connection)
-
-        # Remove disconnected websockets
-        if disconnected:
-            async with self._lock:
-                for ws in disconnected:
-                    if ws in self.global_connections:
-                        self.global_connections.remove(ws)
-                    for entity_type in self.active_connections:
-                        for entity_id in self.active_connections[entity_type]:
-                            connections = self.active_connections[entity_type][entity_id]
-                            if ws in connections:
-                                connections.remove(ws)
+                pass
+
+        self._spawn(close())
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
 
 # Global connection manager instance
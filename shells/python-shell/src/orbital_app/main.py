@@ -4,14 +4,18 @@ Orbital Python Shell - FastAPI Server
 Handles event processing for Orbital applications with PyTorch support.
 Generated code goes in orbital_app/generated/
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from typing import Optional
+import anyio
 import uvicorn
 
 from .core.settings import get_settings
 from .core.firebase import initialize_firebase
+from .core.serialization import FastJSONResponse, dumps
 from .core.websocket import connection_manager
+from .middleware.auth import FirebaseAuthMiddleware
 from .generated.routes import register_routes
 
 # Load settings
@@ -23,6 +27,9 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     print(f"Starting Orbital Python Server (env: {settings.environment})...")
 
+    # Sync endpoints and dependencies run in anyio's thread pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_limit
+
     # Initialize Firebase Admin SDK
     try:
         initialize_firebase()
@@ -43,9 +50,13 @@ app = FastAPI(
     description="FastAPI server for Orbital applications with PyTorch support",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
-# CORS middleware for React client
+# Verify bearer tokens once per request (auth dependencies read the result)
+app.add_middleware(FirebaseAuthMiddleware)
+
+# CORS middleware for React client (added last so it wraps auth)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
@@ -68,30 +79,34 @@ async def health_check():
 
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws")
-async def websocket_global(websocket: WebSocket):
-    """Global WebSocket connection for all updates."""
-    await connection_manager.connect(websocket)
+async def websocket_global(websocket: WebSocket, binary: bool = False):
+    """Global WebSocket connection for all updates (?binary=true for binary frames,
+    or request the "msgpack" subprotocol or send Accept: application/x-msgpack
+    for MessagePack frames)."""
+    await connection_manager.connect(websocket, binary=binary)
     try:
-        while True:
-            # Keep connection alive, handle incoming messages
-            data = await websocket.receive_text()
+        # Keep connection alive, handle incoming messages until disconnect
+        async for data in websocket.iter_text():
             # Echo back for ping/pong
             if data == "ping":
                 await websocket.send_text("pong")
-    except WebSocketDisconnect:
+    finally:
         await connection_manager.disconnect(websocket)
 
 
 @app.websocket("/ws/{entity_type}/{entity_id}")
-async def websocket_entity(websocket: WebSocket, entity_type: str, entity_id: str):
-    """Entity-specific WebSocket connection."""
-    await connection_manager.connect(websocket, entity_type, entity_id)
+async def websocket_entity(
+    websocket: WebSocket, entity_type: str, entity_id: str, binary: bool = False
+):
+    """Entity-specific WebSocket connection (?binary=true for binary frames,
+    or request the "msgpack" subprotocol or send Accept: application/x-msgpack
+    for MessagePack frames)."""
+    await connection_manager.connect(websocket, entity_type, entity_id, binary=binary)
     try:
-        while True:
-            data = await websocket.receive_text()
+        async for data in websocket.iter_text():
             if data == "ping":
                 await websocket.send_text("pong")
-    except WebSocketDisconnect:
+    finally:
         await connection_manager.disconnect(websocket, entity_type, entity_id)
 
 
@@ -99,6 +114,23 @@ async def websocket_entity(websocket: WebSocket, entity_type: str, entity_id: st
 register_routes(app)
 
 
+# FastAPI caches the schema dict but re-encodes it on every request; serve
+# bytes encoded once instead (routes are all registered by the first request)
+_openapi_json: Optional[bytes] = None
+app.router.routes[:] = [
+    route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url
+]
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_json():
+    """OpenAPI schema, encoded once."""
+    global _openapi_json
+    if _openapi_json is None:
+        _openapi_json = dumps(app.openapi())
+    return Response(_openapi_json, media_type="application/json")
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "orbital_app.main:app",
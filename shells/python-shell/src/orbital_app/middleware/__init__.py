@@ -4,6 +4,7 @@ Middleware for Orbital Python Shell.
 - auth: Firebase authentication middleware
 """
 from .auth import (
+    FirebaseAuthMiddleware,
     FirebaseUser,
     get_current_user,
     get_optional_user,
@@ -11,6 +12,7 @@ from .auth import (
 )
 
 __all__ = [
+    "FirebaseAuthMiddleware",
     "FirebaseUser",
     "get_current_user",
     "get_optional_user",
@@ -1,21 +1,56 @@
 """
 Firebase Authentication Middleware
 
-Provides FastAPI dependencies for authenticating requests using Firebase ID tokens.
+Provides FastAPI dependencies for authenticating requests using Firebase ID tokens,
+and an ASGI middleware that verifies the token once per request for them.
 The decoded token provides the @user context for guard evaluation.
 """
-from typing import Optional, Annotated
-from fastapi import Depends, HTTPException, Header, status
-from pydantic import BaseModel
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Annotated, Tuple
+import asyncio
+import anyio
+from fastapi import Depends, HTTPException, Header, Request, status
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from ..core.firebase import verify_id_token
+from ..core.firebase import get_cached_id_token, verify_id_token
 
 
-class FirebaseUser(BaseModel):
+# Token verifications in progress, so concurrent requests with the same
+# token share a single check
+_pending_verifications: Dict[str, "asyncio.Future[dict]"] = {}
+
+# Scope key where FirebaseAuthMiddleware leaves (user, error message)
+_SCOPE_KEY = "firebase_auth"
+
+
+async def _verify_token(token: str) -> dict:
+    """
+    Verify a token without blocking the event loop.
+
+    Cached tokens are answered inline; otherwise the (CPU-bound, possibly
+    certificate-fetching) verification runs in a worker thread.
+    """
+    decoded = get_cached_id_token(token)
+    if decoded is not None:
+        return decoded
+
+    pending = _pending_verifications.get(token)
+    if pending is None:
+        pending = asyncio.ensure_future(anyio.to_thread.run_sync(verify_id_token, token))
+        _pending_verifications[token] = pending
+        pending.add_done_callback(lambda _: _pending_verifications.pop(token, None))
+    # Shield so one cancelled request doesn't cancel the check for the others
+    return dict(await asyncio.shield(pending))
+
+
+@dataclass(slots=True)
+class FirebaseUser:
     """
     Decoded Firebase user from ID token.
 
-    This becomes the @user context in guard expressions.
+    This becomes the @user context in guard expressions. A plain dataclass:
+    the claims were already validated by Firebase, so building one per
+    request skips model validation and shares the claims dict.
     """
 
     uid: str
@@ -26,7 +61,11 @@ class FirebaseUser(BaseModel):
     # Custom claims (e.g., role, permissions)
     role: Optional[str] = None
     # Raw claims for accessing any custom data
-    claims: dict = {}
+    claims: dict = field(default_factory=dict)
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Fields as a dict (same shape as the former Pydantic model)."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
     @classmethod
     def from_decoded_token(cls, decoded: dict) -> "FirebaseUser":
@@ -42,13 +81,54 @@ class FirebaseUser(BaseModel):
         )
 
 
+class FirebaseAuthMiddleware:
+    """
+    ASGI middleware that verifies a request's bearer token once, up front.
+
+    The outcome is stored in the scope, so get_current_user and
+    get_optional_user don't parse headers or verify again. Requests without
+    a bearer token pass through untouched. The dependencies also work
+    without this middleware, verifying the header themselves.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            token = _bearer_token(scope["headers"])
+            if token is not None:
+                scope[_SCOPE_KEY] = await _authenticate(token)
+        await self.app(scope, receive, send)
+
+
+def _bearer_token(headers) -> Optional[str]:
+    """Extract the bearer token from raw ASGI headers."""
+    for name, value in headers:
+        if name == b"authorization":
+            if value.startswith(b"Bearer "):
+                return value[7:].decode("latin-1")
+            return None
+    return None
+
+
+async def _authenticate(token: str) -> Tuple[Optional[FirebaseUser], Optional[str]]:
+    """Verify a token, returning (user, None) or (None, error message)."""
+    try:
+        return FirebaseUser.from_decoded_token(await _verify_token(token)), None
+    except Exception as e:
+        return None, str(e)
+
+
 async def get_current_user(
-    authorization: Annotated[str | None, Header()] = None
+    request: Request,
+    authorization: Annotated[str | None, Header()] = None,
 ) -> FirebaseUser:
     """
     FastAPI dependency to get the current authenticated user.
 
-    Extracts Bearer token from Authorization header and verifies it.
+    Uses the result from FirebaseAuthMiddleware when it ran; otherwise
+    extracts the Bearer token from the Authorization header and verifies it.
 
     Usage:
         @router.post("/events/{event}")
@@ -59,35 +139,37 @@ async def get_current_user(
     Raises:
         HTTPException 401: If no token or invalid token
     """
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authorization header missing",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    if not authorization.startswith("Bearer "):
+    result = request.scope.get(_SCOPE_KEY)
+    if result is None:
+        if not authorization:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Authorization header missing",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if not authorization.startswith("Bearer "):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Authorization header must start with 'Bearer '",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        result = await _authenticate(authorization[7:])  # Remove "Bearer " prefix
+
+    user, error = result
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authorization header must start with 'Bearer '",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    token = authorization[7:]  # Remove "Bearer " prefix
-
-    try:
-        decoded = verify_id_token(token)
-        return FirebaseUser.from_decoded_token(decoded)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid or expired token: {str(e)}",
+            detail=f"Invalid or expired token: {error}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return user
 
 
 async def get_optional_user(
-    authorization: Annotated[str | None, Header()] = None
+    request: Request,
+    authorization: Annotated[str | None, Header()] = None,
 ) -> Optional[FirebaseUser]:
     """
     FastAPI dependency to get the current user if authenticated.
@@ -102,16 +184,13 @@ async def get_optional_user(
             else:
                 # Anonymous access
     """
-    if not authorization or not authorization.startswith("Bearer "):
-        return None
+    result = request.scope.get(_SCOPE_KEY)
+    if result is None:
+        if not authorization or not authorization.startswith("Bearer "):
+            return None
+        result = await _authenticate(authorization[7:])
 
-    token = authorization[7:]
-
-    try:
-        decoded = verify_id_token(token)
-        return FirebaseUser.from_decoded_token(decoded)
-    except Exception:
-        return None
+    return result[0]
 
 
 def require_auth(user: FirebaseUser = Depends(get_current_user)) -> FirebaseUser:
@@ -7,22 +7,32 @@ Neural Network Runtime - PyTorch implementations for nn/* operators.
 - constraints: Weight/gradient constraints
 """
 from .builder import build_network, build_layer
-from .forward import forward
-from .training import train_loop
+from .forward import compile_module, forward
+from .training import train_loop, TrainState
 from .constraints import (
     apply_gradient_clipping,
     apply_weight_clipping,
     check_forbidden_regions,
     compute_constraint_loss,
+    compile_forbidden,
+    count_violations,
+    precompute_forbidden,
+    ForbiddenRegions,
 )
 
 __all__ = [
     "build_network",
     "build_layer",
+    "compile_module",
     "forward",
     "train_loop",
+    "TrainState",
     "apply_gradient_clipping",
     "apply_weight_clipping",
     "check_forbidden_regions",
     "compute_constraint_loss",
+    "compile_forbidden",
+    "count_violations",
+    "precompute_forbidden",
+    "ForbiddenRegions",
 ]
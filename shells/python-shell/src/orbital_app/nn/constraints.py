@@ -6,20 +6,25 @@ Implements constraint checking and enforcement for neural networks:
 - Weight clipping: Keep weights bounded
 - Forbidden regions: Penalize outputs in dangerous ranges
 """
+import functools
+
 import torch
 import torch.nn as nn
-from typing import Dict, Any, List
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
 
 
 def apply_gradient_clipping(module: nn.Module, max_norm: float) -> None:
     """
     Clip gradients to max norm.
 
+    Uses PyTorch's multi-tensor kernels where the device supports them
+    (foreach=True would fail for CPU tensors).
+
     Args:
         module: PyTorch module with gradients
         max_norm: Maximum gradient norm
     """
-    torch.nn.utils.clip_grad_norm_(module.parameters(), max_norm)
+    torch.nn.utils.clip_grad_norm_(module.parameters(), max_norm, foreach=None)
 
 
 def apply_weight_clipping(module: nn.Module, max_magnitude: float) -> None:
@@ -30,75 +35,173 @@ def apply_weight_clipping(module: nn.Module, max_magnitude: float) -> None:
         module: PyTorch module
         max_magnitude: Maximum absolute weight value
     """
+    params = list(module.parameters())
+    if not params:
+        return
+    # One multi-tensor op per bound instead of a clamp per parameter
     with torch.no_grad():
-        for param in module.parameters():
-            param.clamp_(-max_magnitude, max_magnitude)
+        torch._foreach_clamp_min_(params, -max_magnitude)
+        torch._foreach_clamp_max_(params, max_magnitude)
+
+
+# (dim, min, max, reason) for one forbidden region
+RegionSpec = Tuple[int, float, float, str]
+Forbidden = Union[List[Dict[str, Any]], Tuple[RegionSpec, ...]]
+
+
+def compile_forbidden(forbidden: Forbidden) -> Tuple[RegionSpec, ...]:
+    """
+    Extract forbidden region specs into tuples once, for repeated checks.
+
+    Args:
+        forbidden: List of forbidden region specs with 'dim', 'min', 'max',
+            optional 'reason' (already compiled specs are returned as-is)
+
+    Returns:
+        Tuple of (dim, min, max, reason) tuples
+    """
+    if isinstance(forbidden, tuple):
+        return forbidden
+    return tuple(
+        (r["dim"], r["min"], r["max"], r.get("reason", "forbidden region"))
+        for r in forbidden
+    )
+
+
+class ForbiddenRegions(NamedTuple):
+    """Forbidden region bounds as tensors, one entry per region."""
+
+    dims: torch.Tensor
+    mins: torch.Tensor
+    maxs: torch.Tensor
+
+
+def precompute_forbidden(
+    forbidden: Forbidden,
+    device: Optional[torch.device] = None,
+    dtype: torch.dtype = torch.float32,
+) -> ForbiddenRegions:
+    """
+    Stack forbidden region specs into tensors once, for repeated checks.
+
+    Args:
+        forbidden: List of forbidden region specs, or compile_forbidden() result
+        device: Device of the outputs that will be checked
+        dtype: Dtype of the outputs that will be checked
+
+    Returns:
+        ForbiddenRegions usable with compute_constraint_loss
+    """
+    dims, mins, maxs, _ = zip(*compile_forbidden(forbidden)) if forbidden else ((),) * 4
+    return ForbiddenRegions(
+        dims=torch.tensor(dims, dtype=torch.long, device=device),
+        mins=torch.tensor(mins, dtype=dtype, device=device),
+        maxs=torch.tensor(maxs, dtype=dtype, device=device),
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_regions(
+    specs: Tuple[RegionSpec, ...], device: torch.device, dtype: torch.dtype
+) -> ForbiddenRegions:
+    """precompute_forbidden() for compiled specs (shared; don't mutate)."""
+    # Built as normal tensors even under inference_mode, so a later
+    # differentiable caller can save them for backward
+    with torch.inference_mode(False):
+        return precompute_forbidden(specs, device, dtype)
+
+
+def _regions_for(forbidden: Forbidden, output: torch.Tensor) -> ForbiddenRegions:
+    """Region tensors matching output, built once per distinct spec set."""
+    return _cached_regions(compile_forbidden(forbidden), output.device, output.dtype)
+
+
+def _in_region(
+    output: torch.Tensor, regions: ForbiddenRegions
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Gather each region's output value and whether it lies in the region."""
+    values = output[..., regions.dims]
+    return values, (values >= regions.mins) & (values <= regions.maxs)
 
 
 def check_forbidden_regions(
     output: torch.Tensor,
-    forbidden: List[Dict[str, Any]],
+    forbidden: Forbidden,
 ) -> List[Dict[str, Any]]:
     """
     Check if output violates forbidden regions.
 
+    All regions are compared in one vectorized step, with a single copy of
+    the results to the host.
+
     Args:
         output: Network output tensor
-        forbidden: List of forbidden region specs with 'dim', 'min', 'max'
+        forbidden: List of forbidden region specs, or compile_forbidden() result
 
     Returns:
         List of violations with dim, value, and reason
     """
-    violations = []
-    for region in forbidden:
-        dim = region["dim"]
-        min_val = region["min"]
-        max_val = region["max"]
-        value = output[dim].item()
-
-        if min_val <= value <= max_val:
-            violations.append(
-                {
-                    "dim": dim,
-                    "value": value,
-                    "min": min_val,
-                    "max": max_val,
-                    "reason": region.get("reason", "forbidden region"),
-                }
-            )
+    if not forbidden:
+        return []
+
+    specs = compile_forbidden(forbidden)
+    output = output.detach()
+    values, inside = _in_region(output, _regions_for(specs, output))
+    # Only the (usually few) hits are copied to the host
+    hits = inside.nonzero().flatten()
+    values = values[hits].tolist()
 
+    violations = []
+    for index, value in zip(hits.tolist(), values):
+        dim, min_val, max_val, reason = specs[index]
+        violations.append(
+            {"dim": dim, "value": value, "min": min_val, "max": max_val, "reason": reason}
+        )
     return violations
 
 
+def count_violations(output: torch.Tensor, regions: ForbiddenRegions) -> torch.Tensor:
+    """
+    Count outputs in a batch that fall inside any forbidden region.
+
+    Args:
+        output: Batch of network outputs, one row per sample
+        regions: precompute_forbidden() result
+
+    Returns:
+        Scalar integer tensor
+    """
+    _, inside = _in_region(output, regions)
+    return inside.any(dim=-1).sum()
+
+
 def compute_constraint_loss(
     output: torch.Tensor,
-    forbidden: List[Dict[str, Any]],
+    forbidden: Union[Forbidden, ForbiddenRegions],
     penalty: float = 10.0,
 ) -> torch.Tensor:
     """
     Compute penalty loss for forbidden regions.
 
+    Vectorized over regions (and over a leading batch dimension, if any),
+    with no host synchronisation.
+
     Args:
         output: Network output tensor
-        forbidden: List of forbidden region specs
+        forbidden: List of forbidden region specs, or a compile_forbidden() or
+            precompute_forbidden() result
         penalty: Penalty multiplier
 
     Returns:
         Scalar loss tensor
     """
-    loss = torch.tensor(0.0)
-
-    for region in forbidden:
-        dim = region["dim"]
-        min_val = region["min"]
-        max_val = region["max"]
-        value = output[dim]
-
-        # Penalty for being in forbidden region
-        if min_val <= value.item() <= max_val:
-            # Distance to nearest boundary
-            dist_to_min = (value - min_val).abs()
-            dist_to_max = (max_val - value).abs()
-            loss = loss + penalty * torch.min(dist_to_min, dist_to_max)
-
-    return loss
+    if not isinstance(forbidden, ForbiddenRegions):
+        if not forbidden:
+            # No regions: a zero on output's device, with no kernels launched
+            return output.new_zeros(())
+        forbidden = _regions_for(forbidden, output)
+
+    values, inside = _in_region(output, forbidden)
+    # Penalty for being in forbidden region: distance to nearest boundary
+    dist = torch.minimum((values - forbidden.mins).abs(), (forbidden.maxs - values).abs())
+    return penalty * torch.where(inside, dist, torch.zeros_like(dist)).sum()
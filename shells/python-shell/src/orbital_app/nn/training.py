@@ -2,100 +2,212 @@
 Training Loop - Execute train/loop S-expression.
 
 Supports:
-- Configurable epochs, learning rate, optimizer
+- Configurable epochs, learning rate, optimizer, batch size
 - Gradient clipping (maxGradientNorm)
 - Weight clipping (maxWeightMagnitude)
 - Forbidden output regions (constraint loss)
+- Mixed precision (bf16/fp16 autocast)
 """
+from dataclasses import dataclass
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from .constraints import (
     apply_gradient_clipping,
     apply_weight_clipping,
+    compile_forbidden,
     compute_constraint_loss,
+    count_violations,
+    precompute_forbidden,
 )
 
+# config["precision"] -> autocast dtype (None: full fp32)
+_PRECISIONS: Dict[str, Optional[torch.dtype]] = {
+    "fp32": None,
+    "bf16": torch.bfloat16,
+    "fp16": torch.float16,
+}
+
+
+def _grad_scaler() -> Any:
+    """A CUDA gradient scaler, for fp16 training."""
+    if hasattr(torch.amp, "GradScaler"):
+        return torch.amp.GradScaler("cuda")
+    return torch.cuda.amp.GradScaler()
+
+
+@dataclass
+class TrainState:
+    """
+    Optimizer and loss function kept across train_loop calls on one module.
+
+    For retraining the same module repeatedly (e.g. on streaming data):
+    the optimizer is built once and keeps its moment estimates between calls.
+    """
+    optimizer: optim.Optimizer
+    criterion: nn.Module
+    # fp16 gradient scaler on CUDA, created on first use
+    scaler: Optional[Any] = None
+
+    @classmethod
+    def create(cls, module: nn.Module, learning_rate: float = 0.001) -> "TrainState":
+        """Build the Adam optimizer and MSE loss train_loop would use."""
+        # On CUDA the fused Adam step updates every parameter in one kernel
+        params = list(module.parameters())
+        fused = bool(params) and all(p.is_cuda for p in params)
+        return cls(
+            optimizer=optim.Adam(params, lr=learning_rate, fused=fused or None),
+            criterion=nn.MSELoss(),
+        )
+
 
 def train_loop(
     module: nn.Module,
-    data: List[Dict[str, Any]],
+    data: Union[List[Dict[str, Any]], Dict[str, torch.Tensor]],
     config: Dict[str, Any],
+    state: Optional[TrainState] = None,
 ) -> Tuple[nn.Module, Dict[str, Any]]:
     """
     Training loop with explicit constraints.
 
     Args:
         module: PyTorch neural network to train
-        data: Training data as list of dicts with 'observation' and 'target'
+        data: Training data as list of dicts with 'observation' and 'target',
+            or a dict of 'observations' and 'targets' tensors (one row per sample)
         config: Training configuration
+        state: Optional TrainState.create(module) result to reuse across
+            calls; a fresh one is built otherwise
 
     Config fields:
         - epochs: int (default 100)
         - learningRate: float (default 0.001)
+        - batchSize: int (default 32) - samples per optimizer step; 0 or
+          None trains on the whole dataset in one step per epoch
         - maxGradientNorm: float (optional) - clip gradients to this norm
         - maxWeightMagnitude: float (optional) - clip weights to [-max, max]
         - forbiddenOutputRegions: List[Dict] (optional) - constraint regions
+        - precision: "fp32" (default), "bf16" or "fp16" - autocast dtype for
+          the forward pass; fp16 on CUDA scales the loss against underflow
 
     Returns:
         Tuple of (trained module, training history)
     """
     epochs = config.get("epochs", 100)
     lr = config.get("learningRate", 0.001)
+    batch_size = config.get("batchSize", 32)
     max_grad_norm = config.get("maxGradientNorm")
     max_weight_mag = config.get("maxWeightMagnitude")
-    forbidden = config.get("forbiddenOutputRegions", [])
-
-    optimizer = optim.Adam(module.parameters(), lr=lr)
-    criterion = nn.MSELoss()
-
-    history = {"losses": [], "constraint_violations": []}
+    forbidden = compile_forbidden(config.get("forbiddenOutputRegions", []))
+    precision = config.get("precision", "fp32")
+    if precision not in _PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}")
+    autocast_dtype = _PRECISIONS[precision]
+
+    if state is None:
+        state = TrainState.create(module, lr)
+    else:
+        for group in state.optimizer.param_groups:
+            group["lr"] = lr
+    optimizer, criterion = state.optimizer, state.criterion
+
+    # Data, regions and accumulators live on the module's device
+    first_param = next(module.parameters(), None)
+    device = first_param.device if first_param is not None else torch.device("cpu")
+    device_type = device.type
+    # bf16 keeps fp32's exponent range, so only fp16 needs loss scaling
+    scaler = None
+    if autocast_dtype is torch.float16 and device_type == "cuda":
+        if state.scaler is None:
+            state.scaler = _grad_scaler()
+        scaler = state.scaler
+
+    # Region bounds as tensors, built once for the whole run
+    forbidden_regions = precompute_forbidden(forbidden, device) if forbidden else None
+
+    # Materialize the dataset once; each step indexes a row
+    if isinstance(data, dict):
+        observations = torch.as_tensor(data["observations"], dtype=torch.float32, device=device)
+        targets = torch.as_tensor(data["targets"], dtype=torch.float32, device=device)
+    else:
+        observations = torch.tensor([s["observation"] for s in data], dtype=torch.float32, device=device)
+        targets = torch.tensor([s["target"] for s in data], dtype=torch.float32, device=device)
+    num_samples = len(observations)
+    full_batch = not batch_size or batch_size >= num_samples
+
+    # Per-epoch totals stay on-device; read back once after training
+    epoch_losses = torch.zeros(epochs, device=device)
+    epoch_violations = torch.zeros(epochs, dtype=torch.long, device=device)
 
     module.train()
 
     for epoch in range(epochs):
-        total_loss = 0.0
-        violations = 0
-
-        for sample in data:
-            optimizer.zero_grad()
-
-            # Prepare tensors
-            input_tensor = torch.tensor(sample["observation"], dtype=torch.float32)
-            target = torch.tensor(sample["target"], dtype=torch.float32)
-
-            # Forward pass
-            output = module(input_tensor)
+        if not num_samples:
+            continue
+
+        if full_batch:
+            # One step over the whole dataset: order doesn't matter, no gather
+            batches = [slice(None)]
+        else:
+            # Shuffled mini-batches
+            order = torch.randperm(num_samples, device=device)
+            batches = [order[start:start + batch_size] for start in range(0, num_samples, batch_size)]
+
+        for batch in batches:
+            optimizer.zero_grad(set_to_none=True)
+
+            input_tensor = observations[batch]
+            target = targets[batch]
+            batch_len = len(input_tensor)
+
+            # Forward pass (reduced precision if configured); losses and
+            # constraint checks run on the fp32 output
+            with torch.autocast(
+                device_type=device_type,
+                dtype=autocast_dtype or torch.bfloat16,
+                enabled=autocast_dtype is not None,
+            ):
+                output = module(input_tensor)
+            output = output.float()
 
             # Base loss
             loss = criterion(output, target)
 
-            # Add constraint loss if forbidden regions defined
-            if forbidden:
-                constraint_loss = compute_constraint_loss(output, forbidden)
-                loss = loss + constraint_loss
-                if constraint_loss > 0:
-                    violations += 1
+            # Add constraint loss if forbidden regions defined; the
+            # per-sample penalty is averaged like the base loss
+            if forbidden_regions is not None:
+                constraint_loss = compute_constraint_loss(output, forbidden_regions)
+                loss = loss + constraint_loss / batch_len
+                epoch_violations[epoch] += count_violations(output.detach(), forbidden_regions)
 
             # Backward pass
-            loss.backward()
+            if scaler is not None:
+                scaler.scale(loss).backward()
+            else:
+                loss.backward()
 
-            # Gradient clipping
+            # Gradient clipping (of the unscaled gradients)
             if max_grad_norm:
+                if scaler is not None:
+                    scaler.unscale_(optimizer)
                 apply_gradient_clipping(module, max_grad_norm)
 
             # Update weights
-            optimizer.step()
+            if scaler is not None:
+                scaler.step(optimizer)
+                scaler.update()
+            else:
+                optimizer.step()
 
             # Weight clipping
             if max_weight_mag:
                 apply_weight_clipping(module, max_weight_mag)
 
-            total_loss += loss.item()
+            epoch_losses[epoch] += loss.detach() * batch_len
 
-        avg_loss = total_loss / len(data) if data else 0
-        history["losses"].append(avg_loss)
-        history["constraint_violations"].append(violations)
+    history = {
+        "losses": (epoch_losses / max(num_samples, 1)).tolist(),
+        "constraint_violations": epoch_violations.tolist(),
+    }
 
     return module, history
@@ -32,7 +32,9 @@ __all__ = [
     "tensor_max",
     "tensor_min",
     "tensor_argmax",
+    "tensor_argmax_tensor",
     "tensor_norm",
+    "tensor_stats",
     # Range Validation
     "tensor_all_in_range",
     "tensor_clamp",
@@ -40,6 +42,7 @@ __all__ = [
     "tensor_out_of_range_dims",
     # Conversion
     "tensor_to_list",
+    "tensor_to_numpy",
     # Contracts
     "InputContract",
     "OutputContract",
@@ -3,8 +3,43 @@ Tensor Operations - tensor/* S-expression implementations.
 
 All 28 tensor operators from orbital-shared/std/modules/tensor.ts.
 """
+import functools
 import torch
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Sequence, Tuple
+
+
+# fn -> torch.compile'd fn (or fn itself, if compiling failed)
+_compiled: Dict[Callable, Callable] = {}
+
+
+def _compile_for_cuda(fn: Callable) -> Callable:
+    """
+    Run fn compiled for CUDA tensors and eagerly for everything else.
+
+    On GPU, compiling fuses fn's small kernels into one and captures it as
+    a CUDA graph, removing the per-kernel launch cost that dominates at the
+    tensor sizes used here. On CPU, compilation costs more than it saves.
+    fn's first argument decides; compilation happens on first CUDA use and
+    falls back to eager mode if torch.compile isn't usable.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(tensor: torch.Tensor, *args: Any) -> Any:
+        if not tensor.is_cuda:
+            return fn(tensor, *args)
+        compiled = _compiled.get(fn)
+        if compiled is None:
+            compiled = _compiled[fn] = torch.compile(fn, mode="reduce-overhead", dynamic=False)
+        if compiled is fn:
+            return fn(tensor, *args)
+        try:
+            return compiled(tensor, *args)
+        except Exception as e:
+            print(f"torch.compile unavailable for {fn.__name__}, using eager mode: {e}")
+            _compiled[fn] = fn
+            return fn(tensor, *args)
+
+    return wrapper
 
 
 # =============================================================================
@@ -129,7 +164,12 @@ def tensor_min(tensor: torch.Tensor) -> float:
 
 def tensor_argmax(tensor: torch.Tensor) -> int:
     """Index of max element."""
-    return tensor.argmax().item()
+    return tensor_argmax_tensor(tensor).item()
+
+
+def tensor_argmax_tensor(tensor: torch.Tensor) -> torch.Tensor:
+    """Index of max element as a 0-dim tensor, left on the tensor's device."""
+    return tensor.argmax()
 
 
 def tensor_norm(tensor: torch.Tensor) -> float:
@@ -137,6 +177,51 @@ def tensor_norm(tensor: torch.Tensor) -> float:
     return tensor.norm().item()
 
 
+_STATS = ("sum", "mean", "max", "min", "argmax", "norm")
+
+
+def tensor_stats(
+    tensor: torch.Tensor, which: Sequence[str] = _STATS
+) -> Dict[str, float]:
+    """
+    Several reductions with a single host sync.
+
+    mean and norm are derived from sum and the sum of squares, and max/min
+    share one aminmax pass. Results are copied to the host together.
+
+    Args:
+        tensor: Tensor to reduce
+        which: Stats to compute, from sum, mean, max, min, argmax, norm
+
+    Returns:
+        Dict of stat name to value (argmax as int)
+    """
+    unknown = set(which) - set(_STATS)
+    if unknown:
+        raise ValueError(f"Unknown tensor stats: {sorted(unknown)}")
+    if not which:
+        return {}
+
+    reduced: Dict[str, torch.Tensor] = {}
+    if "sum" in which or "mean" in which:
+        reduced["sum"] = tensor.sum()
+        if "mean" in which:
+            reduced["mean"] = reduced["sum"] / tensor.numel()
+    if "max" in which or "min" in which:
+        reduced["min"], reduced["max"] = torch.aminmax(tensor)
+    if "argmax" in which:
+        reduced["argmax"] = tensor_argmax_tensor(tensor)
+    if "norm" in which:
+        reduced["norm"] = tensor.square().sum().sqrt()
+
+    # float64 keeps argmax exact
+    values = torch.stack([reduced[name].double() for name in which]).tolist()
+    stats = dict(zip(which, values))
+    if "argmax" in stats:
+        stats["argmax"] = int(stats["argmax"])
+    return stats
+
+
 # =============================================================================
 # Range Validation
 # =============================================================================
@@ -145,7 +230,11 @@ def tensor_norm(tensor: torch.Tensor) -> float:
 def tensor_all_in_range(tensor: torch.Tensor, range_: List[float]) -> bool:
     """Check all elements in range [min, max]."""
     min_val, max_val = range_
-    return bool((tensor >= min_val).all() and (tensor <= max_val).all())
+    if tensor.numel() == 0:
+        return True
+    # Both extrema in one pass, one host sync
+    lo, hi = torch.aminmax(tensor)
+    return bool((lo >= min_val) & (hi <= max_val))
 
 
 def tensor_clamp(tensor: torch.Tensor, min_val: float, max_val: float) -> torch.Tensor:
@@ -153,16 +242,62 @@ def tensor_clamp(tensor: torch.Tensor, min_val: float, max_val: float) -> torch.
     return tensor.clamp(min_val, max_val)
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_ranges(
+    ranges_key: Tuple[Tuple[str, float, float], ...],
+    dtype: torch.dtype,
+    device: torch.device,
+) -> Tuple[Tuple[int, ...], torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Parse (dim_str, min, max) specs into dims and index/min/max tensors (shared; don't mutate)."""
+    dims = tuple(int(dim_str) for dim_str, _, _ in ranges_key)
+    # Built as normal tensors even under inference_mode, so a later
+    # differentiable clamp can save them for backward
+    with torch.inference_mode(False):
+        index = torch.tensor(dims, dtype=torch.long, device=device)
+        mins = torch.tensor([lo for _, lo, _ in ranges_key], dtype=dtype, device=device)
+        maxs = torch.tensor([hi for _, _, hi in ranges_key], dtype=dtype, device=device)
+    return dims, index, mins, maxs
+
+
+def _per_dim_bounds(
+    tensor: torch.Tensor,
+    ranges: Dict[str, Dict[str, float]],
+    dtype: torch.dtype,
+) -> Tuple[Tuple[int, ...], torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Dims (in ranges order) and their index, min and max tensors, on tensor's device."""
+    key = tuple((dim_str, b["min"], b["max"]) for dim_str, b in ranges.items())
+    return _compile_ranges(key, dtype, tensor.device)
+
+
 def tensor_clamp_per_dim(
     tensor: torch.Tensor,
     ranges: Dict[str, Dict[str, float]],
 ) -> torch.Tensor:
     """Clamp each dimension to its specified range."""
-    result = tensor.clone()
-    for dim_str, bounds in ranges.items():
-        dim = int(dim_str)
-        result[dim] = result[dim].clamp(bounds["min"], bounds["max"])
-    return result
+    if not ranges:
+        return tensor.clone()
+
+    # Per-dim bounds along the first axis, applied in one broadcast clamp
+    # that writes the result directly (no clone of the input)
+    dtype = tensor.dtype if tensor.is_floating_point() else torch.float64
+    dims, index, lo, hi = _per_dim_bounds(tensor, ranges, dtype)
+    if dims != tuple(range(tensor.shape[0])):
+        # Only some dims are bounded: the rest get -inf/inf
+        unbounded = torch.full((tensor.shape[0],), float("inf"), dtype=dtype, device=tensor.device)
+        lo = (-unbounded).index_put_((index,), lo)
+        hi = unbounded.index_put_((index,), hi)
+    shape = (-1,) + (1,) * (tensor.dim() - 1)
+    return torch.clamp(tensor, lo.view(shape), hi.view(shape)).to(tensor.dtype)
+
+
+@_compile_for_cuda
+def _gather_out_of_range(
+    tensor: torch.Tensor, index: torch.Tensor, mins: torch.Tensor, maxs: torch.Tensor
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Values at index, and whether each lies outside [min, max]."""
+    values = tensor.index_select(0, index)
+    wide = values.to(mins.dtype)
+    return values, (wide < mins) | (wide > maxs)
 
 
 def tensor_out_of_range_dims(
@@ -170,20 +305,19 @@ def tensor_out_of_range_dims(
     ranges: Dict[str, Dict[str, float]],
 ) -> List[Dict[str, Any]]:
     """Get dimensions that exceed ranges."""
-    violations = []
-    for dim_str, bounds in ranges.items():
-        dim = int(dim_str)
-        value = tensor[dim].item()
-        if value < bounds["min"] or value > bounds["max"]:
-            violations.append(
-                {
-                    "dim": dim,
-                    "value": value,
-                    "min": bounds["min"],
-                    "max": bounds["max"],
-                }
-            )
-    return violations
+    if not ranges:
+        return []
+
+    # One gather and compare on-device (in float64, like comparing Python
+    # floats), then a single copy of values and mask to the host
+    dims, index, mins, maxs = _per_dim_bounds(tensor, ranges, torch.float64)
+    values, outside = _gather_out_of_range(tensor, index, mins, maxs)
+
+    return [
+        {"dim": dim, "value": value, "min": bounds["min"], "max": bounds["max"]}
+        for dim, bounds, value, out in zip(dims, ranges.values(), values.tolist(), outside.tolist())
+        if out
+    ]
 
 
 # =============================================================================
@@ -192,5 +326,15 @@ def tensor_out_of_range_dims(
 
 
 def tensor_to_list(tensor: torch.Tensor) -> List[float]:
-    """Convert tensor to Python list."""
+    """Convert tensor to Python list (boxes every element; see tensor_to_numpy)."""
     return tensor.tolist()
+
+
+def tensor_to_numpy(tensor: torch.Tensor) -> Any:
+    """
+    Convert tensor to a NumPy array, without copying for CPU tensors.
+
+    Much cheaper than tensor_to_list for large tensors: elements stay
+    unboxed. Requires numpy to be installed.
+    """
+    return tensor.detach().cpu().numpy()
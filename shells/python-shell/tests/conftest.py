@@ -5,18 +5,32 @@ Common fixtures for shell framework tests.
 """
 
 import pytest
-import torch
-from fastapi.testclient import TestClient
 
 # Configure pytest-asyncio
 pytest_plugins = ('pytest_asyncio',)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_client():
-    """Create a FastAPI test client for HTTP and WebSocket testing."""
+    """Create a FastAPI test client for HTTP and WebSocket testing.
+
+    Shared by the whole session: the app and its state are module-level
+    anyway, so a client per test only repeated the import and setup.
+    Entering the client runs the app's lifespan once and keeps one event
+    loop for every request, instead of starting a loop per request.
+    """
+    from fastapi.testclient import TestClient
     from orbital_app.main import app
-    return TestClient(app)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(test_client):
+    """The app's OpenAPI schema, fetched once (routes don't change at runtime)."""
+    response = test_client.get("/openapi.json")
+    assert response.status_code == 200
+    return response.json()
 
 
 @pytest.fixture
@@ -52,12 +66,21 @@ def simple_network():
     ])
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def training_data():
-    """Simple training data."""
-    return [
-        {"observation": [1.0, 0.0, 0.0, 0.0], "target": [1.0, 0.0]},
-        {"observation": [0.0, 1.0, 0.0, 0.0], "target": [0.0, 1.0]},
-        {"observation": [0.0, 0.0, 1.0, 0.0], "target": [1.0, 0.0]},
-        {"observation": [0.0, 0.0, 0.0, 1.0], "target": [0.0, 1.0]},
-    ]
+    """Simple training data as tensors, one row per sample (treat as read-only)."""
+    import torch
+    return {
+        "observations": torch.tensor([
+            [1.0, 0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ]),
+        "targets": torch.tensor([
+            [1.0, 0.0],
+            [0.0, 1.0],
+            [1.0, 0.0],
+            [0.0, 1.0],
+        ]),
+    }
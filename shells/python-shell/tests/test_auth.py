@@ -0,0 +1,105 @@
+"""
+Auth Middleware Tests
+
+Tests for middleware/auth.py - Firebase token dependencies.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from orbital_app.core import firebase
+from orbital_app.middleware import auth
+
+
+def _request() -> Request:
+    """A bare request, as seen when FirebaseAuthMiddleware isn't installed."""
+    return Request({"type": "http", "headers": []})
+
+
+class TestGetCurrentUser:
+    """Tests for get_current_user."""
+
+    @pytest.fixture
+    def verified(self, monkeypatch):
+        """Replace Firebase verification with a slow, counting fake."""
+        calls = []
+
+        def fake_verify(token):
+            calls.append(threading.current_thread())
+            time.sleep(0.05)
+            if token == "bad":
+                raise ValueError("invalid token")
+            return {"uid": token, "exp": time.time() + 3600}
+
+        monkeypatch.setattr(firebase, "_app", object())
+        monkeypatch.setattr(firebase.auth, "verify_id_token", fake_verify)
+        firebase.clear_token_cache()
+        yield calls
+        firebase.clear_token_cache()
+
+    async def test_concurrent_requests_share_one_verification(self, verified):
+        """Test the same token is verified once, off the event loop."""
+        users = await asyncio.gather(
+            *(auth.get_current_user(_request(), "Bearer user-1") for _ in range(3))
+        )
+
+        assert [user.uid for user in users] == ["user-1"] * 3
+        assert len(verified) == 1
+        assert verified[0] is not threading.main_thread()
+
+    async def test_cached_token_skips_verification(self, verified):
+        """Test a verified token is answered from the cache."""
+        await auth.get_current_user(_request(), "Bearer user-1")
+        user = await auth.get_current_user(_request(), "Bearer user-1")
+
+        assert user.uid == "user-1"
+        assert len(verified) == 1
+
+    async def test_invalid_token_rejected(self, verified):
+        """Test a failed verification becomes a 401."""
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(_request(), "Bearer bad")
+
+        assert exc_info.value.status_code == 401
+        assert await auth.get_optional_user(_request(), "Bearer bad") is None
+
+    def test_middleware_verifies_once_per_request(self, verified):
+        """Test dependencies use the middleware's result instead of re-verifying."""
+        app = FastAPI()
+        app.add_middleware(auth.FirebaseAuthMiddleware)
+
+        @app.get("/me")
+        async def me(
+            user: auth.FirebaseUser = Depends(auth.get_current_user),
+            optional: auth.FirebaseUser = Depends(auth.get_optional_user),
+        ):
+            return {"uid": user.uid, "same": optional is user}
+
+        client = TestClient(app)
+        ok = client.get("/me", headers={"Authorization": "Bearer user-2"})
+        missing = client.get("/me")
+        bad = client.get("/me", headers={"Authorization": "Bearer bad"})
+
+        assert ok.json() == {"uid": "user-2", "same": True}
+        assert missing.status_code == 401
+        assert missing.json()["detail"] == "Authorization header missing"
+        assert bad.status_code == 401
+        assert len(verified) == 2
+
+
+class TestFirebaseUser:
+    """Tests for FirebaseUser."""
+
+    def test_from_decoded_token(self):
+        """Test fields are read from the claims, which are kept as-is."""
+        decoded = {"uid": "u1", "email": "a@b.c", "role": "admin", "org": "acme"}
+
+        user = auth.FirebaseUser.from_decoded_token(decoded)
+
+        assert (user.uid, user.email, user.email_verified, user.role) == ("u1", "a@b.c", False, "admin")
+        assert user.claims is decoded
+        assert user.model_dump()["claims"]["org"] == "acme"
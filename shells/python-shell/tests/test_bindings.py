@@ -0,0 +1,113 @@
+"""
+Bindings Tests
+
+Tests for core/bindings.py - @entity, @payload, @user binding resolution.
+"""
+
+import pytest
+from orbital_app.core.bindings import resolve_binding, resolve_bindings_in_dict
+
+
+class TestResolveBinding:
+    """Tests for resolve_binding."""
+
+    def test_literal_passthrough(self):
+        """Test non-binding values are returned unchanged."""
+        assert resolve_binding("plain", {}) == "plain"
+        assert resolve_binding(42, {}) == 42
+        assert resolve_binding(None, {}) is None
+
+    def test_root_binding(self):
+        """Test resolving a bare root binding."""
+        context = {"payload": {"name": "Test"}}
+        assert resolve_binding("@payload", context) == {"name": "Test"}
+
+    def test_nested_path(self):
+        """Test resolving a nested dict path."""
+        context = {"entity": {"owner": {"name": "Ada"}}}
+        assert resolve_binding("@entity.owner.name", context) == "Ada"
+
+    def test_attribute_path(self):
+        """Test resolving a path through object attributes."""
+
+        class User:
+            uid = "user-1"
+
+        assert resolve_binding("@user.uid", {"user": User()}) == "user-1"
+
+    def test_missing_root(self):
+        """Test missing root resolves to None."""
+        assert resolve_binding("@entity.status", {}) is None
+
+    def test_missing_intermediate(self):
+        """Test a None along the path resolves to None."""
+        context = {"entity": {"owner": None}}
+        assert resolve_binding("@entity.owner.name", context) is None
+
+    def test_same_binding_different_contexts(self):
+        """Test a reused binding string resolves against each context."""
+        assert resolve_binding("@payload.id", {"payload": {"id": "a"}}) == "a"
+        assert resolve_binding("@payload.id", {"payload": {"id": "b"}}) == "b"
+
+
+class TestResolveBindingsInDict:
+    """Tests for resolve_bindings_in_dict."""
+
+    def test_resolves_nested_structures(self):
+        """Test bindings are resolved in nested dicts and lists."""
+        data = {
+            "name": "@payload.name",
+            "meta": {"owner": "@user.uid", "kind": "task"},
+            "tags": ["@payload.tag", "static", 3, {"id": "@entity.id"}],
+            "count": 1,
+        }
+        context = {
+            "payload": {"name": "Test", "tag": "urgent"},
+            "user": {"uid": "user-1"},
+            "entity": {"id": "task-1"},
+        }
+
+        result = resolve_bindings_in_dict(data, context)
+
+        assert result == {
+            "name": "Test",
+            "meta": {"owner": "user-1", "kind": "task"},
+            "tags": ["urgent", "static", 3, {"id": "task-1"}],
+            "count": 1,
+        }
+
+    def test_reused_template_resolves_per_context(self):
+        """Test the same template dict resolves against each new context."""
+        data = {"id": "@payload.id", "items": ["@payload.id"]}
+
+        first = resolve_bindings_in_dict(data, {"payload": {"id": "a"}})
+        second = resolve_bindings_in_dict(data, {"payload": {"id": "b"}})
+
+        assert first == {"id": "a", "items": ["a"]}
+        assert second == {"id": "b", "items": ["b"]}
+        assert first is not second
+        assert first["items"] is not second["items"]
+
+    def test_template_mutated_in_place(self):
+        """Test edits to a template dict show up on the next resolve."""
+        data = {"id": "@payload.id"}
+        context = {"payload": {"id": "a", "name": "Test"}}
+
+        assert resolve_bindings_in_dict(data, context) == {"id": "a"}
+
+        data["name"] = "@payload.name"
+
+        assert resolve_bindings_in_dict(data, context) == {"id": "a", "name": "Test"}
+
+    def test_binding_free_subtrees_are_copied(self):
+        """Test subtrees without bindings come back as fresh containers."""
+        static = {"kind": "card", "children": [{"text": "Hello"}]}
+        data = {"title": "@payload.title", "body": static}
+
+        result = resolve_bindings_in_dict(data, {"payload": {"title": "Hi"}})
+
+        assert result == {"title": "Hi", "body": static}
+        assert result["body"] is not static
+        assert result["body"]["children"] is not static["children"]
+        assert result["body"]["children"][0] is not static["children"][0]
+        assert resolve_bindings_in_dict(static, {}) is not static
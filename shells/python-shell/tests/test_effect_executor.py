@@ -22,7 +22,6 @@ class TestEffectExecutor:
         """Create an executor with the repository."""
         return EffectExecutor(repository)
 
-    @pytest.mark.asyncio
     async def test_execute_fetch_single(self, executor, repository):
         """Test fetching a single entity by ID."""
         # Seed data
@@ -38,11 +37,9 @@ class TestEffectExecutor:
         assert result["name"] == "Test Task"
         assert "Task" in executor.data
 
-    @pytest.mark.asyncio
     async def test_execute_fetch_collection(self, executor, repository):
         """Test fetching all entities of a type."""
-        await repository.create("Task", {"name": "Task 1"})
-        await repository.create("Task", {"name": "Task 2"})
+        await repository.bulk_create("Task", [{"name": "Task 1"}, {"name": "Task 2"}])
 
         effect = ["fetch", "Task"]
         context = {}
@@ -52,11 +49,12 @@ class TestEffectExecutor:
         assert isinstance(result, list)
         assert len(result) == 2
 
-    @pytest.mark.asyncio
     async def test_execute_fetch_with_filter(self, executor, repository):
         """Test fetching with S-expression filter."""
-        await repository.create("Task", {"name": "Task 1", "status": "pending"})
-        await repository.create("Task", {"name": "Task 2", "status": "completed"})
+        await repository.bulk_create("Task", [
+            {"name": "Task 1", "status": "pending"},
+            {"name": "Task 2", "status": "completed"},
+        ])
 
         # Filter requires non-empty context to be applied by repository
         effect = ["fetch", "Task", {"filter": ["=", "@entity.status", "pending"]}]
@@ -67,7 +65,6 @@ class TestEffectExecutor:
         assert len(result) == 1
         assert result[0]["status"] == "pending"
 
-    @pytest.mark.asyncio
     async def test_execute_persist_create(self, executor, repository):
         """Test persist create effect."""
         effect = ["persist", "create", "Task", {"name": "New Task", "status": "pending"}]
@@ -82,7 +79,6 @@ class TestEffectExecutor:
         assert executor.effect_results[0]["action"] == "create"
         assert executor.effect_results[0]["success"] is True
 
-    @pytest.mark.asyncio
     async def test_execute_persist_update(self, executor, repository):
         """Test persist update effect."""
         created = await repository.create("Task", {"name": "Original", "status": "pending"})
@@ -96,7 +92,6 @@ class TestEffectExecutor:
         assert result["status"] == "completed"
         assert executor.effect_results[0]["action"] == "update"
 
-    @pytest.mark.asyncio
     async def test_execute_persist_delete(self, executor, repository):
         """Test persist delete effect."""
         created = await repository.create("Task", {"name": "To Delete"})
@@ -114,7 +109,6 @@ class TestEffectExecutor:
         deleted = await repository.get("Task", entity_id)
         assert deleted is None
 
-    @pytest.mark.asyncio
     async def test_execute_client_effects_collected(self, executor):
         """Test that client effects are collected."""
         context = {}
@@ -129,7 +123,6 @@ class TestEffectExecutor:
         assert executor.client_effects[1][0] == "navigate"
         assert executor.client_effects[2][0] == "notify"
 
-    @pytest.mark.asyncio
     async def test_execute_render_ui_variations(self, executor):
         """Test render_ui and render-ui both work."""
         context = {}
@@ -139,7 +132,6 @@ class TestEffectExecutor:
 
         assert len(executor.client_effects) == 2
 
-    @pytest.mark.asyncio
     async def test_execute_emit_as_client_effect(self, executor):
         """Test emit is collected as client effect."""
         effect = ["emit", "TASK_CREATED", {"taskId": "123"}]
@@ -150,7 +142,6 @@ class TestEffectExecutor:
         assert len(executor.client_effects) == 1
         assert executor.client_effects[0][0] == "emit"
 
-    @pytest.mark.asyncio
     async def test_execute_set_effect(self, executor):
         """Test set effect updates entity field."""
         context = {"entity": {"name": "Original", "status": "pending"}}
@@ -162,19 +153,25 @@ class TestEffectExecutor:
         assert len(executor.effect_results) == 1
         assert executor.effect_results[0]["effect"] == "set"
 
-    @pytest.mark.asyncio
+    async def test_execute_set_nested_effect(self, executor):
+        """Test set effect writes nested fields, creating missing dicts."""
+        context = {"entity": {"meta": {}}, "payload": {"user": "ada"}}
+
+        await executor.execute(["set", "@entity.meta.owner", "@payload.user"], context)
+        await executor.execute(["set", "@entity.stats.count", 3], context)
+
+        assert context["entity"] == {"meta": {"owner": "ada"}, "stats": {"count": 3}}
+
     async def test_execute_empty_effect(self, executor):
         """Test empty effect returns None."""
         result = await executor.execute([], {})
         assert result is None
 
-    @pytest.mark.asyncio
     async def test_execute_unknown_effect(self, executor):
         """Test unknown effect returns None."""
         result = await executor.execute(["unknown_effect", "arg"], {})
         assert result is None
 
-    @pytest.mark.asyncio
     async def test_resolve_bindings_in_context(self, executor, repository):
         """Test that @payload bindings are resolved."""
         effect = ["persist", "create", "Task", "@payload"]
@@ -185,7 +182,6 @@ class TestEffectExecutor:
         assert result["name"] == "From Payload"
         assert result["status"] == "new"
 
-    @pytest.mark.asyncio
     async def test_call_service_not_implemented(self, executor):
         """Test call_service returns not_implemented."""
         effect = ["call_service", "email", "send", {"to": "test@test.com"}]
@@ -195,3 +191,25 @@ class TestEffectExecutor:
 
         assert result["status"] == "not_implemented"
         assert executor.effect_results[0]["success"] is False
+
+    async def test_fetch_cache_cleared_by_persist(self):
+        """Test a persist invalidates cached reads."""
+        gets = []
+
+        class RecordingRepository(InMemoryRepository):
+            async def get(self, entity_type, entity_id):
+                gets.append(entity_id)
+                return await super().get(entity_type, entity_id)
+
+        repo = RecordingRepository()
+        repo.seed("Task", [{"id": "task-1", "status": "pending"}])
+        executor = EffectExecutor(repo)
+        context = {"entityId": "task-1"}
+
+        await executor.execute(["fetch", "Task", {"id": "task-1"}], context)
+        await executor.execute(["fetch", "Task", {"id": "task-1"}], context)
+        await executor.execute(["persist", "delete", "Task"], context)
+        result = await executor.execute(["fetch", "Task", {"id": "task-1"}], context)
+
+        assert gets == ["task-1", "task-1"]
+        assert result is None
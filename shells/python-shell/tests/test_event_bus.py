@@ -4,6 +4,8 @@ Event Bus Tests
 Tests for core/event_bus.py - Event publishing and subscription.
 """
 
+import asyncio
+
 import pytest
 from orbital_app.core.event_bus import EventBus, get_event_bus
 
@@ -16,7 +18,6 @@ class TestEventBus:
         """Create a fresh event bus for each test."""
         return EventBus()
 
-    @pytest.mark.asyncio
     async def test_subscribe_and_emit(self, event_bus):
         """Test subscribing to event and receiving it."""
         received = []
@@ -30,7 +31,6 @@ class TestEventBus:
         assert len(received) == 1
         assert received[0]["data"] == "test"
 
-    @pytest.mark.asyncio
     async def test_emit_with_payload(self, event_bus):
         """Test emitting event with data payload."""
         received_payload = None
@@ -44,7 +44,6 @@ class TestEventBus:
 
         assert received_payload == {"id": "123", "name": "Test"}
 
-    @pytest.mark.asyncio
     async def test_emit_without_payload(self, event_bus):
         """Test emitting event without payload."""
         received_payload = None
@@ -58,7 +57,6 @@ class TestEventBus:
 
         assert received_payload == {}
 
-    @pytest.mark.asyncio
     async def test_multiple_subscribers(self, event_bus):
         """Test multiple handlers receive event."""
         received_by_1 = []
@@ -79,7 +77,6 @@ class TestEventBus:
         assert received_by_1[0]["value"] == 42
         assert received_by_2[0]["value"] == 42
 
-    @pytest.mark.asyncio
     async def test_unsubscribe(self, event_bus):
         """Test unsubscribing stops receiving events."""
         received = []
@@ -96,7 +93,6 @@ class TestEventBus:
         assert len(received) == 1
         assert received[0]["first"] is True
 
-    @pytest.mark.asyncio
     async def test_once_subscription(self, event_bus):
         """Test once=True subscription only fires once."""
         received = []
@@ -113,7 +109,23 @@ class TestEventBus:
         assert len(received) == 1
         assert received[0]["call"] == 1
 
-    @pytest.mark.asyncio
+    async def test_once_subscription_concurrent_emits(self, event_bus):
+        """Test a once=True async handler isn't re-run by an emit while it awaits."""
+        received = []
+
+        async def handler(payload):
+            await asyncio.sleep(0.01)
+            received.append(payload)
+
+        event_bus.subscribe("ONCE_EVENT", handler, once=True)
+
+        await asyncio.gather(
+            event_bus.emit("ONCE_EVENT", {"call": 1}),
+            event_bus.emit("ONCE_EVENT", {"call": 2}),
+        )
+
+        assert received == [{"call": 1}]
+
     async def test_async_handler(self, event_bus):
         """Test async handler is awaited properly."""
         received = []
@@ -127,13 +139,62 @@ class TestEventBus:
         assert len(received) == 1
         assert received[0]["async"] is True
 
-    @pytest.mark.asyncio
+    async def test_async_handlers_run_concurrently(self, event_bus):
+        """Test a slow async handler doesn't block the others."""
+        order = []
+        release = asyncio.Event()
+
+        async def slow_handler(payload):
+            await release.wait()
+            order.append("slow")
+
+        async def fast_handler(payload):
+            order.append("fast")
+            release.set()
+
+        event_bus.subscribe("CONCURRENT_EVENT", slow_handler)
+        event_bus.subscribe("CONCURRENT_EVENT", fast_handler)
+        await asyncio.wait_for(event_bus.emit("CONCURRENT_EVENT", {}), timeout=1.0)
+
+        assert order == ["fast", "slow"]
+
+    async def test_partial_of_async_handler_is_awaited(self, event_bus):
+        """Test handlers that return a coroutine are awaited too."""
+        import functools
+        received = []
+
+        async def handler(tag, payload):
+            received.append((tag, payload))
+
+        event_bus.subscribe("PARTIAL_EVENT", functools.partial(handler, "a"))
+
+        await event_bus.emit("PARTIAL_EVENT", {"n": 1})
+
+        assert received == [("a", {"n": 1})]
+
+    async def test_async_handler_error_doesnt_break_others(self, event_bus):
+        """Test that an error in one async handler doesn't stop others."""
+        received = []
+
+        async def bad_handler(payload):
+            raise ValueError("Handler error")
+
+        async def good_handler(payload):
+            received.append(payload)
+
+        event_bus.subscribe("ASYNC_ERROR_EVENT", bad_handler, once=True)
+        event_bus.subscribe("ASYNC_ERROR_EVENT", good_handler, once=True)
+
+        await event_bus.emit("ASYNC_ERROR_EVENT", {"n": 1})
+        await event_bus.emit("ASYNC_ERROR_EVENT", {"n": 2})
+
+        assert received == [{"n": 1}]
+
     async def test_emit_to_nonexistent_event(self, event_bus):
         """Test emitting to event with no subscribers."""
         # Should not raise
         await event_bus.emit("NOBODY_LISTENING", {"data": "ignored"})
 
-    @pytest.mark.asyncio
     async def test_clear_specific_event(self, event_bus):
         """Test clearing subscriptions for specific event."""
         received_a = []
@@ -150,7 +211,6 @@ class TestEventBus:
         assert len(received_a) == 0
         assert len(received_b) == 1
 
-    @pytest.mark.asyncio
     async def test_clear_all_events(self, event_bus):
         """Test clearing all subscriptions."""
         received_a = []
@@ -167,7 +227,6 @@ class TestEventBus:
         assert len(received_a) == 0
         assert len(received_b) == 0
 
-    @pytest.mark.asyncio
     async def test_handler_error_doesnt_break_others(self, event_bus):
         """Test that error in one handler doesn't stop others."""
         received = []
@@ -192,3 +251,77 @@ class TestEventBus:
         bus2 = get_event_bus()
 
         assert bus1 is bus2
+
+    async def test_subscribe_many(self, event_bus):
+        """Test bulk subscription calls handlers in order and unsubscribes together."""
+        received = []
+        handlers = [lambda p, i=i: received.append(i) for i in range(3)]
+
+        unsubscribe = event_bus.subscribe_many("BULK_EVENT", handlers)
+        event_bus.subscribe("BULK_EVENT", lambda p: received.append("other"))
+        await event_bus.emit("BULK_EVENT")
+        unsubscribe()
+        await event_bus.emit("BULK_EVENT")
+
+        assert received == [0, 1, 2, "other", "other"]
+
+    async def test_unsubscribe_keeps_other_handlers(self, event_bus):
+        """Test unsubscribing one handler leaves the rest in order."""
+        calls = []
+
+        unsubs = [
+            event_bus.subscribe("ORDER_EVENT", lambda p, i=i: calls.append(i))
+            for i in range(4)
+        ]
+        unsubs[1]()
+        unsubs[1]()  # Repeated unsubscribe is a no-op
+
+        await event_bus.emit("ORDER_EVENT", {})
+
+        assert calls == [0, 2, 3]
+
+    async def test_unsubscribing_last_handler_drops_event(self, event_bus):
+        """Test events with no subscribers left aren't kept, even mid-emit."""
+        received = []
+
+        def resubscribe(payload):
+            unsubscribe()
+            event_bus.subscribe("RESUB_EVENT", lambda p: received.append(p))
+
+        unsubscribe = event_bus.subscribe("RESUB_EVENT", resubscribe)
+        event_bus.subscribe("GONE_EVENT", lambda p: None)()
+
+        await event_bus.emit("RESUB_EVENT", {"call": 1})
+        await event_bus.emit("RESUB_EVENT", {"call": 2})
+
+        assert received == [{"call": 2}]
+        assert list(event_bus._subscriptions) == ["RESUB_EVENT"]
+
+    async def test_subscription_changes_between_emits(self, event_bus):
+        """Test handlers added or removed after an emit are seen by the next one."""
+        calls = []
+
+        unsubscribe = event_bus.subscribe("CHANGE_EVENT", lambda p: calls.append("a"))
+        await event_bus.emit("CHANGE_EVENT")
+        event_bus.subscribe("CHANGE_EVENT", lambda p: calls.append("b"))
+        event_bus.subscribe("CHANGE_EVENT", lambda p: calls.append("once"), once=True)
+        await event_bus.emit("CHANGE_EVENT")
+        unsubscribe()
+        await event_bus.emit("CHANGE_EVENT")
+
+        assert calls == ["a", "a", "b", "once", "b"]
+
+    async def test_same_handler_subscribed_twice(self, event_bus):
+        """Test each subscription of the same handler unsubscribes independently."""
+        received = []
+
+        def handler(payload):
+            received.append(payload)
+
+        unsubscribe_first = event_bus.subscribe("DUP_EVENT", handler)
+        event_bus.subscribe("DUP_EVENT", handler)
+        unsubscribe_first()
+
+        await event_bus.emit("DUP_EVENT", {})
+
+        assert len(received) == 1
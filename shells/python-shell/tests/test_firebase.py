@@ -0,0 +1,81 @@
+"""
+Firebase Tests
+
+Tests for core/firebase.py - ID token verification caching.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from orbital_app.core import firebase
+
+
+class TestVerifyIdToken:
+    """Tests for verify_id_token caching."""
+
+    @pytest.fixture
+    def verified(self, monkeypatch):
+        """Replace Firebase verification with a counting fake."""
+        calls = []
+
+        def fake_verify(token):
+            calls.append(token)
+            return {"uid": token, "exp": time.time() + 3600}
+
+        monkeypatch.setattr(firebase, "_app", object())
+        monkeypatch.setattr(firebase.auth, "verify_id_token", fake_verify)
+        firebase.clear_token_cache()
+        yield calls
+        firebase.clear_token_cache()
+
+    def test_repeat_token_is_verified_once(self, verified):
+        """Test a cached token skips verification."""
+        first = firebase.verify_id_token("token-a")
+        second = firebase.verify_id_token("token-a")
+
+        assert first == second
+        assert first["uid"] == "token-a"
+        assert verified == ["token-a"]
+
+    def test_cached_claims_are_copied(self, verified):
+        """Test callers can't mutate the cached claims."""
+        firebase.verify_id_token("token-a")["uid"] = "changed"
+
+        assert firebase.verify_id_token("token-a")["uid"] == "token-a"
+
+    def test_expired_token_is_not_cached(self, verified, monkeypatch):
+        """Test tokens past their exp claim are verified every time."""
+        monkeypatch.setattr(
+            firebase.auth, "verify_id_token",
+            lambda token: verified.append(token) or {"uid": token, "exp": 0},
+        )
+
+        firebase.verify_id_token("token-a")
+        firebase.verify_id_token("token-a")
+
+        assert verified == ["token-a", "token-a"]
+
+    def test_clear_token_cache(self, verified):
+        """Test a cleared token is verified again."""
+        firebase.verify_id_token("token-a")
+        firebase.clear_token_cache("token-a")
+        firebase.verify_id_token("token-a")
+
+        assert verified == ["token-a", "token-a"]
+
+    def test_concurrent_verification_from_threads(self, verified, monkeypatch):
+        """Test worker threads can verify, evict and clear at the same time."""
+        monkeypatch.setattr(firebase, "_TOKEN_CACHE_SIZE", 8)
+
+        def verify(i):
+            token = f"token-{i % 32}"
+            if i % 50 == 0:
+                firebase.clear_token_cache(token)
+            return firebase.verify_id_token(token)["uid"] == token
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(verify, range(2000)))
+
+        assert all(results)
+        assert len(firebase._token_cache) <= 8
@@ -17,11 +17,9 @@ from fastapi.testclient import TestClient
 class TestGeneratedTraitRoutes:
     """Test that generated trait routes work correctly."""
 
-    def get_trait_routes(self, client: TestClient) -> List[str]:
+    def get_trait_routes(self, openapi_schema: Dict[str, Any]) -> List[str]:
         """Get all trait route prefixes from OpenAPI schema."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        paths = response.json().get("paths", {})
+        paths = openapi_schema.get("paths", {})
 
         # Find unique trait prefixes (e.g., /api/neural_network_manager)
         prefixes = set()
@@ -33,9 +31,9 @@ class TestGeneratedTraitRoutes:
 
         return list(prefixes)
 
-    def test_all_traits_have_state_endpoint(self, test_client: TestClient):
+    def test_all_traits_have_state_endpoint(self, test_client: TestClient, openapi_schema):
         """All generated traits have a /state endpoint."""
-        trait_prefixes = self.get_trait_routes(test_client)
+        trait_prefixes = self.get_trait_routes(openapi_schema)
 
         for prefix in trait_prefixes:
             response = test_client.get(f"{prefix}/state")
@@ -43,9 +41,9 @@ class TestGeneratedTraitRoutes:
             data = response.json()
             assert "state" in data, f"State response missing 'state' field for {prefix}"
 
-    def test_state_endpoint_returns_valid_state(self, test_client: TestClient):
+    def test_state_endpoint_returns_valid_state(self, test_client: TestClient, openapi_schema):
         """State endpoints return valid state names."""
-        trait_prefixes = self.get_trait_routes(test_client)
+        trait_prefixes = self.get_trait_routes(openapi_schema)
 
         for prefix in trait_prefixes:
             response = test_client.get(f"{prefix}/state")
@@ -59,15 +57,14 @@ class TestGeneratedTraitRoutes:
 class TestINITEvent:
     """Test INIT event handling for traits that have it."""
 
-    def get_init_routes(self, client: TestClient) -> List[str]:
+    def get_init_routes(self, openapi_schema: Dict[str, Any]) -> List[str]:
         """Get all trait routes that have INIT event."""
-        response = client.get("/openapi.json")
-        paths = response.json().get("paths", {})
+        paths = openapi_schema.get("paths", {})
         return [path for path in paths.keys() if "/events/init" in path]
 
-    def test_init_event_works(self, test_client: TestClient):
+    def test_init_event_works(self, test_client: TestClient, openapi_schema):
         """INIT event transitions trait from idle state."""
-        init_routes = self.get_init_routes(test_client)
+        init_routes = self.get_init_routes(openapi_schema)
 
         for route in init_routes:
             # Extract trait prefix for state check
@@ -91,9 +88,9 @@ class TestINITEvent:
             assert "effects" in data, f"Response missing 'effects' for {route}"
             assert "state" in data, f"Response missing 'state' for {route}"
 
-    def test_init_returns_effects(self, test_client: TestClient):
+    def test_init_returns_effects(self, test_client: TestClient, openapi_schema):
         """INIT event returns render-ui effects with action buttons."""
-        init_routes = self.get_init_routes(test_client)
+        init_routes = self.get_init_routes(openapi_schema)
 
         for route in init_routes:
             response = test_client.post(
@@ -158,18 +155,17 @@ class TestEffectFormat:
 class TestEventRequest:
     """Test event request validation."""
 
-    def get_any_event_route(self, client: TestClient) -> str:
+    def get_any_event_route(self, openapi_schema: Dict[str, Any]) -> str:
         """Get any event route for testing."""
-        response = client.get("/openapi.json")
-        paths = response.json().get("paths", {})
+        paths = openapi_schema.get("paths", {})
         for path in paths.keys():
             if "/events/" in path:
                 return path
         return None
 
-    def test_event_requires_entity_id(self, test_client: TestClient):
+    def test_event_requires_entity_id(self, test_client: TestClient, openapi_schema):
         """Event requests require entity_id."""
-        route = self.get_any_event_route(test_client)
+        route = self.get_any_event_route(openapi_schema)
         if not route:
             pytest.skip("No event routes found")
 
@@ -181,9 +177,9 @@ class TestEventRequest:
         # Should fail validation
         assert response.status_code == 422
 
-    def test_event_accepts_payload(self, test_client: TestClient):
+    def test_event_accepts_payload(self, test_client: TestClient, openapi_schema):
         """Event requests accept optional payload."""
-        route = self.get_any_event_route(test_client)
+        route = self.get_any_event_route(openapi_schema)
         if not route:
             pytest.skip("No event routes found")
 
@@ -199,15 +195,27 @@ class TestEventRequest:
         assert response.status_code in (200, 400, 500)  # May fail for business logic reasons
 
 
+@pytest.fixture(scope="session")
+def global_ws(test_client):
+    """One global WebSocket connection, opened once and shared by the session."""
+    with test_client.websocket_connect("/ws") as ws:
+        yield ws
+
+
 class TestWebSocketBroadcast:
     """Test WebSocket broadcasting of effects."""
 
-    def test_websocket_connect(self, test_client: TestClient):
+    def test_websocket_connect(self, global_ws):
         """Can connect to global WebSocket."""
-        with test_client.websocket_connect("/ws") as ws:
-            ws.send_text("ping")
-            response = ws.receive_text()
-            assert response == "pong"
+        global_ws.send_text("ping")
+        response = global_ws.receive_text()
+        assert response == "pong"
+
+    def test_websocket_connection_reused(self, global_ws):
+        """A connection keeps answering after earlier exchanges."""
+        for _ in range(3):
+            global_ws.send_text("ping")
+            assert global_ws.receive_text() == "pong"
 
     def test_websocket_entity_connect(self, test_client: TestClient):
         """Can connect to entity-specific WebSocket."""
@@ -220,10 +228,9 @@ class TestWebSocketBroadcast:
 class TestStateTransitions:
     """Test state machine transitions."""
 
-    def get_trait_with_multiple_events(self, client: TestClient) -> Dict[str, Any]:
+    def get_trait_with_multiple_events(self, openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
         """Find a trait with multiple events to test transitions."""
-        response = client.get("/openapi.json")
-        paths = response.json().get("paths", {})
+        paths = openapi_schema.get("paths", {})
 
         # Group events by trait
         trait_events: Dict[str, List[str]] = {}
@@ -243,9 +250,9 @@ class TestStateTransitions:
 
         return None
 
-    def test_state_changes_after_event(self, test_client: TestClient):
+    def test_state_changes_after_event(self, test_client: TestClient, openapi_schema):
         """State changes after processing an event."""
-        trait_info = self.get_trait_with_multiple_events(test_client)
+        trait_info = self.get_trait_with_multiple_events(openapi_schema)
         if not trait_info:
             pytest.skip("No trait with multiple events found")
 
@@ -9,8 +9,16 @@ Tests the full request/response cycle including:
 """
 import pytest
 import asyncio
+import json
 from typing import List, Any, Dict
 from fastapi.testclient import TestClient
+from orbital_app.core import websocket as ws_module
+from orbital_app.core.effect_executor import EffectExecutor
+from orbital_app.core.event_bus import EventBus
+from orbital_app.core.event_router import EventResponse
+from orbital_app.core.repository import InMemoryRepository
+from orbital_app.core.serialization import dumps
+from orbital_app.core.websocket import ConnectionManager, make_json_serializable
 
 
 class TestHealthCheck:
@@ -52,6 +60,17 @@ class TestEventAPIRoutes:
         api_routes = [p for p in paths if p.startswith("/api/")]
         assert len(api_routes) > 0, "Should have API routes registered"
 
+    def test_openapi_schema_encoded_once(self, test_client: TestClient):
+        """Repeated schema requests are served from the same encoded bytes."""
+        from orbital_app import main
+
+        first = test_client.get("/openapi.json")
+        second = test_client.get("/openapi.json")
+
+        assert first.headers["content-type"] == "application/json"
+        assert first.content == second.content == main._openapi_json
+        assert "/openapi.json" not in first.json()["paths"]
+
 
 class TestExampleTaskRoutes:
     """Test the example task routes from shell template (if present)."""
@@ -114,18 +133,14 @@ class TestWebSocket:
 class TestConnectionManager:
     """Test WebSocket connection manager directly."""
 
-    @pytest.mark.asyncio
     async def test_connection_manager_init(self):
         """Connection manager initializes correctly."""
-        from orbital_app.core.websocket import ConnectionManager
         manager = ConnectionManager()
         assert manager.active_connections == {}
-        assert manager.global_connections == []
+        assert manager.global_connections == set()
 
-    @pytest.mark.asyncio
     async def test_broadcast_without_connections(self):
         """Broadcast doesn't fail without connections."""
-        from orbital_app.core.websocket import ConnectionManager
         manager = ConnectionManager()
 
         # Should not raise
@@ -137,21 +152,285 @@ class TestConnectionManager:
             data={"tasks": {"id": "123"}},
         )
 
-    @pytest.mark.asyncio
     async def test_broadcast_global(self):
         """Global broadcast doesn't fail."""
-        from orbital_app.core.websocket import ConnectionManager
         manager = ConnectionManager()
 
         await manager.broadcast_global({"type": "test", "data": {}})
 
+    async def test_broadcast_encodes_tensors(self):
+        """Tensors are encoded, as text or binary frames per connection."""
+        import torch
+
+        class FakeWebSocket:
+            scope = {"type": "websocket"}
+
+            def __init__(self):
+                self.sent = []
+
+            async def accept(self):
+                pass
+
+            async def send_text(self, text):
+                self.sent.append(text)
+
+            async def send_bytes(self, data):
+                self.sent.append(data)
+
+        manager = ConnectionManager()
+        text_ws, binary_ws = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(text_ws)
+        await manager.connect(binary_ws, binary=True)
+
+        await manager.broadcast_global({"type": "metrics", "loss": torch.tensor([0.5, 0.25])})
+        await asyncio.sleep(0.01)
+
+        expected = {"type": "metrics", "loss": [0.5, 0.25]}
+        assert isinstance(text_ws.sent[0], str)
+        assert isinstance(binary_ws.sent[0], bytes)
+        assert [json.loads(m) for m in text_ws.sent + binary_ws.sent] == [expected, expected]
+
+    async def test_msgpack_subprotocol(self):
+        """Clients requesting the msgpack subprotocol get MessagePack frames."""
+        import torch
+        msgpack = pytest.importorskip("msgpack")
+
+        class FakeWebSocket:
+            scope = {"type": "websocket", "subprotocols": ["msgpack"]}
+
+            def __init__(self):
+                self.sent = []
+                self.subprotocol = None
+
+            async def accept(self, subprotocol=None):
+                self.subprotocol = subprotocol
+
+            async def send_bytes(self, data):
+                self.sent.append(data)
+
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+
+        await manager.broadcast_global({"type": "metrics", "loss": torch.tensor([0.5, 0.25])})
+        await asyncio.sleep(0.01)
+
+        assert ws.subprotocol == "msgpack"
+        assert [msgpack.unpackb(m) for m in ws.sent] == [{"type": "metrics", "loss": [0.5, 0.25]}]
+
+    async def test_msgpack_accept_header(self):
+        """Clients sending Accept: application/x-msgpack get MessagePack; others JSON."""
+        msgpack = pytest.importorskip("msgpack")
+
+        class FakeWebSocket:
+            def __init__(self, headers):
+                self.scope = {"type": "websocket", "headers": headers}
+                self.sent = []
+
+            async def accept(self, subprotocol=None):
+                pass
+
+            async def send_text(self, data):
+                self.sent.append(json.loads(data))
+
+            async def send_bytes(self, data):
+                self.sent.append(msgpack.unpackb(data))
+
+        manager = ConnectionManager()
+        packed = FakeWebSocket([(b"accept", b"application/x-msgpack")])
+        plain = FakeWebSocket([(b"accept", b"application/json")])
+        await manager.connect(packed, "tasks", "123")
+        await manager.connect(plain, "tasks", "123")
+
+        await manager.broadcast_client_effects(
+            "tasks", "123", "complete", [["notify", {"message": "Done"}]], {"done": True}
+        )
+        await asyncio.sleep(0.01)
+
+        assert manager._writers[packed].wire_format == "msgpack"
+        assert packed.sent == plain.sent
+        assert packed.sent[0]["effects"] == [["notify", {"message": "Done"}]]
+
+    async def test_slow_client_does_not_block_broadcast(self):
+        """Broadcasts only queue; clients that fall too far behind are dropped."""
+
+        release_slow = asyncio.Event()
+
+        class FakeWebSocket:
+            scope = {"type": "websocket"}
+
+            def __init__(self, slow=False):
+                self.slow = slow
+                self.sent: List[str] = []
+                self.close_code = None
+
+            async def accept(self):
+                pass
+
+            async def send_text(self, text):
+                if self.slow:
+                    await release_slow.wait()
+                self.sent.append(text)
+
+            async def close(self, code=1000):
+                self.close_code = code
+
+        manager = ConnectionManager()
+        slow, fast = FakeWebSocket(slow=True), FakeWebSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        # The first message is taken by the stuck writer; the rest fill its queue
+        for i in range(ws_module._SEND_QUEUE_SIZE + 2):
+            await manager.broadcast_global({"seq": i})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == ws_module._SEND_QUEUE_SIZE + 2
+        assert manager.global_connections == {fast}
+        assert slow.close_code == ws_module._CLOSE_TOO_SLOW
+        release_slow.set()
+
+    async def test_large_broadcast_yields_and_keeps_order(self):
+        """Many connections all get each shared frame, in broadcast order."""
+
+        class FakeWebSocket:
+            scope = {"type": "websocket"}
+
+            def __init__(self):
+                self.sent: List[str] = []
+
+            async def accept(self):
+                pass
+
+            async def send_text(self, text):
+                self.sent.append(text)
+
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket() for _ in range(120)]
+        for ws in sockets:
+            await manager.connect(ws, "Model", "m1")
+        # The last socket is also the only subscriber of a second entity
+        last = sockets[-1]
+        await manager.connect(last, "Model", "m2")
+
+        # The second broadcast starts while the first is yielding part-way
+        await asyncio.gather(
+            manager.broadcast_to_entity("Model", "m1", {"seq": 0}),
+            manager.broadcast_to_entity("Model", "m2", {"seq": 1}),
+        )
+        await asyncio.sleep(0.01)
+
+        assert len(sockets) > ws_module.BROADCAST_BATCH_SIZE
+        first = sockets[0].sent[0]
+        assert first == '{"seq":0}'
+        assert all(ws.sent == [first] and ws.sent[0] is first for ws in sockets[:-1])
+        assert last.sent == ['{"seq":0}', '{"seq":1}']
+
+    async def test_disconnect_keeps_other_subscriptions(self):
+        """Leaving one entity doesn't stop sends for the socket's other entity."""
+
+        class FakeWebSocket:
+            scope = {"type": "websocket"}
+
+            def __init__(self):
+                self.sent: List[str] = []
+
+            async def accept(self):
+                pass
+
+            async def send_text(self, text):
+                self.sent.append(text)
+
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "Model", "m1")
+        await manager.connect(ws, "Model", "m2")
+
+        await manager.disconnect(ws, "Model", "m1")
+        await manager.broadcast_to_entity("Model", "m2", {"seq": 0})
+        await asyncio.sleep(0.01)
+
+        assert ws.sent == ['{"seq":0}']
+        assert ws in manager._writers
+
+        await manager.disconnect(ws, "Model", "m2")
+
+        assert ws not in manager._writers
+        assert manager.active_connections == {}
+
+    async def test_failed_send_drops_connection(self):
+        """A connection whose send raises is removed."""
+
+        class DeadWebSocket:
+            scope = {"type": "websocket"}
+
+            async def accept(self):
+                pass
+
+            async def send_text(self, text):
+                raise RuntimeError("connection closed")
+
+        manager = ConnectionManager()
+        await manager.connect(DeadWebSocket(), "tasks", "123")
+
+        await manager.broadcast_to_entity("tasks", "123", {"type": "test"})
+        await asyncio.sleep(0.01)
+
+        assert manager.active_connections == {}
+
+    async def test_scheduled_client_effects_are_batched(self):
+        """Effects scheduled in quick succession go out as one batch message."""
+
+        class FakeWebSocket:
+            scope = {"type": "websocket"}
+
+            def __init__(self):
+                self.sent: List[str] = []
+
+            async def accept(self):
+                pass
+
+            async def send_text(self, text):
+                self.sent.append(text)
+
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "Model", "m1")
+
+        for epoch in range(3):
+            manager.schedule_client_effects("Model", "m1", "EPOCH", [["notify", {"epoch": epoch}]])
+        await asyncio.sleep(0.05)
+
+        assert len(ws.sent) == 1
+        batch = json.loads(ws.sent[0])
+        assert batch["type"] == "client_effects_batch"
+        assert [item["effects"][0][1]["epoch"] for item in batch["items"]] == [0, 1, 2]
+
+    def test_make_json_serializable_converts_torch_values(self):
+        """Tensors and modules nested in containers are converted."""
+        import torch
+
+        result = make_json_serializable({
+            "loss": torch.tensor(0.5),
+            "weights": (torch.ones(2), 3),
+            "model": torch.nn.Linear(1, 1),
+            "name": "net",
+        })
+
+        assert result == {
+            "loss": 0.5,
+            "weights": [[1.0, 1.0], 3],
+            "model": "<Linear>",
+            "name": "net",
+        }
+
 
 class TestEventResponse:
     """Test event response format."""
 
     def test_event_response_model(self):
         """EventResponse model has correct fields."""
-        from orbital_app.core.event_router import EventResponse
 
         response = EventResponse(
             success=True,
@@ -165,13 +444,68 @@ class TestEventResponse:
         assert response.data == {"test": "data"}
         assert len(response.clientEffects) == 1
 
+    def test_event_response_to_response(self):
+        """EventResponse serializes directly to a JSON response."""
+
+        response = EventResponse(
+            success=True,
+            newState="completed",
+            clientEffects=[["notify", {"message": "Done"}]],
+        ).to_response()
+
+        assert response.status_code == 200
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {
+            "success": True,
+            "newState": "completed",
+            "data": {},
+            "clientEffects": [["notify", {"message": "Done"}]],
+            "effectResults": [],
+            "error": None,
+        }
+
+    def test_event_response_encodes_firestore_values(self):
+        """Firestore timestamps and geo points in data are encoded."""
+        from datetime import datetime, timezone
+        from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+        from google.cloud.firestore_v1 import GeoPoint
+
+        created = DatetimeWithNanoseconds(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        response = EventResponse(
+            success=True,
+            newState="idle",
+            data={"Place": {"createdAt": created, "location": GeoPoint(1.5, -2.0)}},
+        ).to_response()
+
+        place = json.loads(response.body)["data"]["Place"]
+        assert datetime.fromisoformat(place["createdAt"]) == created
+        assert place["location"] == {"latitude": 1.5, "longitude": -2.0}
+
+
+def _stdlib_json():
+    return json.dumps, json.loads
+
+
+def _shell_json():
+    return dumps, json.loads
+
+
+def _orjson():
+    orjson = pytest.importorskip("orjson")
+    return orjson.dumps, orjson.loads
+
 
 class TestClientEffectsFormat:
     """Test that client effects are properly formatted."""
 
-    def test_client_effects_json_serializable(self):
+    @pytest.fixture(params=[_stdlib_json, _shell_json, _orjson], ids=["json", "shell", "orjson"])
+    def codec(self, request):
+        """(dumps, loads) for each encoder effects may go through."""
+        return request.param()
+
+    def test_client_effects_json_serializable(self, codec):
         """All client effects must be JSON serializable."""
-        import json
+        dumps, loads = codec
 
         effects: List[Any] = [
             ["render-ui", "main", {"type": "entity-detail", "entity": "Task"}],
@@ -181,13 +515,13 @@ class TestClientEffectsFormat:
         ]
 
         # Should not raise
-        serialized = json.dumps(effects)
-        deserialized = json.loads(serialized)
+        serialized = dumps(effects)
+        deserialized = loads(serialized)
         assert deserialized == effects
 
-    def test_nested_effects_serializable(self):
+    def test_nested_effects_serializable(self, codec):
         """Nested effect data is JSON serializable."""
-        import json
+        dumps, loads = codec
 
         effect = [
             "render-ui",
@@ -203,8 +537,8 @@ class TestClientEffectsFormat:
             }
         ]
 
-        serialized = json.dumps(effect)
-        deserialized = json.loads(serialized)
+        serialized = dumps(effect)
+        deserialized = loads(serialized)
         assert deserialized == effect
 
 
@@ -227,11 +561,8 @@ class TestCORSConfiguration:
 class TestEffectExecutor:
     """Test the effect executor."""
 
-    @pytest.mark.asyncio
     async def test_effect_executor_init(self):
         """Effect executor initializes correctly."""
-        from orbital_app.core.effect_executor import EffectExecutor
-        from orbital_app.core.repository import InMemoryRepository
 
         repo = InMemoryRepository()
         executor = EffectExecutor(repo)
@@ -240,11 +571,8 @@ class TestEffectExecutor:
         assert executor.client_effects == []
         assert executor.effect_results == []
 
-    @pytest.mark.asyncio
     async def test_effect_executor_client_effects(self):
         """Effect executor collects client effects."""
-        from orbital_app.core.effect_executor import EffectExecutor
-        from orbital_app.core.repository import InMemoryRepository
 
         repo = InMemoryRepository()
         executor = EffectExecutor(repo)
@@ -262,10 +590,8 @@ class TestEffectExecutor:
 class TestRepository:
     """Test the repository layer."""
 
-    @pytest.mark.asyncio
     async def test_in_memory_repository_crud(self):
         """In-memory repository supports CRUD operations."""
-        from orbital_app.core.repository import InMemoryRepository
 
         repo = InMemoryRepository()
 
@@ -291,10 +617,8 @@ class TestRepository:
         gone = await repo.get("tasks", entity["id"])
         assert gone is None
 
-    @pytest.mark.asyncio
     async def test_in_memory_repository_list(self):
         """In-memory repository supports listing entities."""
-        from orbital_app.core.repository import InMemoryRepository
 
         repo = InMemoryRepository()
 
@@ -311,10 +635,8 @@ class TestRepository:
 class TestEventBus:
     """Test the event bus."""
 
-    @pytest.mark.asyncio
     async def test_event_bus_subscribe_emit(self):
         """Event bus handles subscribe and emit."""
-        from orbital_app.core.event_bus import EventBus
 
         bus = EventBus()
         received = []
@@ -328,10 +650,8 @@ class TestEventBus:
         assert len(received) == 1
         assert received[0]["data"] == "test"
 
-    @pytest.mark.asyncio
     async def test_event_bus_once(self):
         """Event bus once subscription only fires once."""
-        from orbital_app.core.event_bus import EventBus
 
         bus = EventBus()
         received = []
@@ -11,9 +11,12 @@ from orbital_app.nn.constraints import (
     apply_gradient_clipping,
     apply_weight_clipping,
     check_forbidden_regions,
+    compile_forbidden,
     compute_constraint_loss,
+    precompute_forbidden,
 )
 from orbital_app.nn.builder import build_network
+from orbital_app.tensor.ops import tensor_stats
 
 
 class TestGradientClipping:
@@ -96,8 +99,9 @@ class TestWeightClipping:
 
         apply_weight_clipping(network, max_magnitude=0.5)
 
-        assert network.weight.min().item() >= -0.5 - 1e-6
-        assert network.weight.max().item() <= 0.5 + 1e-6
+        stats = tensor_stats(network.weight.detach(), ["min", "max"])
+        assert stats["min"] >= -0.5 - 1e-6
+        assert stats["max"] <= 0.5 + 1e-6
 
 
 class TestForbiddenRegions:
@@ -141,6 +145,29 @@ class TestForbiddenRegions:
 
         assert len(violations) == 3
 
+        # Many regions: only those over dims 0 and 1 are hit
+        output = torch.linspace(0.5, 1.0, 1000)
+        output[:2] = 0.05
+        forbidden = [
+            {"dim": dim, "min": 0.0, "max": 0.1, "reason": f"zone {dim}"}
+            for dim in range(1000)
+        ]
+
+        violations = check_forbidden_regions(output, forbidden)
+
+        assert [v["dim"] for v in violations] == [0, 1]
+        assert violations[1]["reason"] == "zone 1"
+
+    def test_check_forbidden_regions_compiled(self):
+        """Test compiled specs give the same violations as the dicts."""
+        output = torch.tensor([0.5, 0.05])
+        forbidden = [{"dim": 1, "min": 0.0, "max": 0.1, "reason": "dead zone"}]
+
+        compiled = compile_forbidden(forbidden)
+
+        assert compiled == ((1, 0.0, 0.1, "dead zone"),)
+        assert check_forbidden_regions(output, compiled) == check_forbidden_regions(output, forbidden)
+
 
 class TestConstraintLoss:
     """Tests for constraint loss computation."""
@@ -178,6 +205,16 @@ class TestConstraintLoss:
         # Scaled loss should be approximately 2x
         assert abs(loss_scaled.item() / loss_default.item() - 2.0) < 0.1
 
+        # Same with many regions, each hit 0.05 from its boundary
+        output = torch.full((1000,), 0.05)
+        forbidden = [{"dim": dim, "min": 0.0, "max": 0.1} for dim in range(1000)]
+
+        loss_default = compute_constraint_loss(output, forbidden, penalty=10.0)
+        loss_scaled = compute_constraint_loss(output, forbidden, penalty=20.0)
+
+        assert abs(loss_default.item() - 10.0 * 0.05 * 1000) < 1e-2
+        assert abs(loss_scaled.item() / loss_default.item() - 2.0) < 0.1
+
     def test_compute_constraint_loss_empty_forbidden(self):
         """Test zero loss when no forbidden regions defined."""
         output = torch.tensor([0.5, 0.5])
@@ -185,3 +222,33 @@ class TestConstraintLoss:
         loss = compute_constraint_loss(output, [])
 
         assert loss.item() == 0.0
+        assert loss.dtype == output.dtype and loss.device == output.device
+
+    def test_compute_constraint_loss_precomputed_batch(self):
+        """Test precomputed regions give the same loss, summed over a batch."""
+        forbidden = [
+            {"dim": 0, "min": 0.0, "max": 0.1},
+            {"dim": 1, "min": 0.4, "max": 0.6},
+        ]
+        output = torch.tensor([0.05, 0.45])
+
+        expected = compute_constraint_loss(output, forbidden)
+        loss = compute_constraint_loss(output, precompute_forbidden(forbidden))
+        batch_loss = compute_constraint_loss(output.repeat(3, 1), precompute_forbidden(forbidden))
+
+        assert torch.allclose(loss, expected)
+        assert torch.allclose(batch_loss, expected * 3)
+
+    def test_compute_constraint_loss_after_inference_check(self):
+        """Test regions cached by an inference-mode check still support backward."""
+        from orbital_app.nn import constraints
+
+        constraints._cached_regions.cache_clear()
+        forbidden = [{"dim": 0, "min": 0.0, "max": 0.1}]
+        with torch.inference_mode():
+            check_forbidden_regions(torch.tensor([0.05]), forbidden)
+
+        output = torch.tensor([0.05], requires_grad=True)
+        compute_constraint_loss(output, forbidden).backward()
+
+        assert output.grad is not None
@@ -7,7 +7,7 @@ Tests for nn/forward.py - Neural network inference.
 import pytest
 import torch
 import torch.nn as nn
-from orbital_app.nn.forward import forward
+from orbital_app.nn.forward import compile_module, forward
 from orbital_app.nn.builder import build_network
 
 
@@ -96,3 +96,61 @@ class TestForward:
         output = forward(network, batch_input)
 
         assert output.shape == (3, 2)
+
+    def test_forward_after_training_switches_to_eval(self):
+        """Test a module put back in train mode is switched to eval again."""
+        network = build_network([
+            "nn/sequential",
+            ["nn/linear", 4, 8],
+            ["nn/dropout", 0.5],
+            ["nn/linear", 8, 2],
+        ])
+        input_tensor = torch.randn(4)
+
+        forward(network, input_tensor)
+        network.train()
+        output1 = forward(network, input_tensor)
+        output2 = forward(network, input_tensor)
+
+        assert not any(m.training for m in network.modules())
+        assert torch.allclose(output1, output2)
+
+    def test_forward_does_not_compile(self, simple_network, monkeypatch):
+        """Test forward never compiles on the request path, and CPU modules stay eager."""
+        def fail_compile(*args, **kwargs):
+            raise AssertionError("torch.compile called")
+
+        monkeypatch.setattr(torch, "compile", fail_compile)
+
+        compile_module(simple_network, torch.randn(4))
+        output = forward(simple_network, torch.randn(4))
+
+        assert output.shape == (2,)
+        assert "_orbital_compiled" not in simple_network.__dict__
+
+    @pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA not available")
+    def test_compiled_outputs_survive_later_calls(self, simple_network):
+        """Test a compiled module's outputs aren't overwritten, across batch sizes."""
+        network = simple_network.cuda()
+        compile_module(network, torch.randn(2, 4, device="cuda"))
+        first_input = torch.randn(3, 4, device="cuda")
+
+        first = forward(network, first_input)
+        expected = first.clone()
+        forward(network, torch.randn(5, 4, device="cuda"))
+
+        assert "_orbital_compiled" in network.__dict__
+        assert torch.equal(first, expected)
+        assert torch.allclose(first, network(first_input), atol=1e-5)
+
+    def test_forward_output_serializes_directly(self):
+        """Test a batched output encodes straight from the tensor, keeping its shape."""
+        import json
+        from orbital_app.core.serialization import dumps
+
+        network = build_network(["nn/sequential", ["nn/linear", 4, 2]])
+        output = forward(network, torch.randn(3, 4))
+
+        decoded = json.loads(dumps({"output": output}))["output"]
+
+        assert torch.tensor(decoded).shape == output.shape
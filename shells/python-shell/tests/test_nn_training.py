@@ -7,7 +7,7 @@ Tests for nn/training.py - Training loop with constraints.
 import pytest
 import torch
 import torch.nn as nn
-from orbital_app.nn.training import train_loop
+from orbital_app.nn.training import TrainState, train_loop
 from orbital_app.nn.builder import build_network
 
 
@@ -95,6 +95,22 @@ class TestTrainLoop:
         assert "constraint_violations" in history
         assert len(history["constraint_violations"]) == 10
 
+    def test_train_loop_counts_violations_per_sample(self, training_data):
+        """Test violations count samples, not mini-batches."""
+        network = nn.Linear(4, 2)
+        nn.init.zeros_(network.weight)
+        nn.init.zeros_(network.bias)
+        config = {
+            "epochs": 1,
+            "learningRate": 0.0,
+            "batchSize": 3,
+            "forbiddenOutputRegions": [{"dim": 0, "min": -0.1, "max": 0.1}],
+        }
+
+        _, history = train_loop(network, training_data, config)
+
+        assert history["constraint_violations"] == [4]
+
     def test_train_history(self, simple_network, training_data):
         """Test that history tracking works correctly."""
         config = {"epochs": 5, "learningRate": 0.01}
@@ -128,3 +144,89 @@ class TestTrainLoop:
         assert len(history["losses"]) == 5
         # All losses should be 0 (no data to compute loss)
         assert all(loss == 0 for loss in history["losses"])
+
+
+class TestTrainLoopTensorData:
+    """Tests for training on tensor data (the shared conftest fixtures)."""
+
+    def test_train_loop_tensor_data(self, simple_network, training_data):
+        """Test observations/targets tensors train like the list form."""
+        config = {"epochs": 50, "learningRate": 0.01}
+
+        _, history = train_loop(simple_network, training_data, config)
+
+        assert len(history["losses"]) == 50
+        assert history["losses"][0] > history["losses"][-1]
+
+    def test_train_loop_full_batch(self, training_data):
+        """Test batchSize 0 takes one optimizer step per epoch over all samples."""
+        network = nn.Linear(4, 2)
+        steps = []
+        network.register_forward_hook(lambda _, inputs, __: steps.append(len(inputs[0])))
+        config = {
+            "epochs": 3,
+            "batchSize": 0,
+            "forbiddenOutputRegions": [{"dim": 0, "min": -10.0, "max": 10.0}],
+        }
+
+        _, history = train_loop(network, training_data, config)
+
+        assert steps == [len(training_data["observations"])] * 3
+        assert history["constraint_violations"] == [len(training_data["observations"])] * 3
+
+
+class TestTrainState:
+    """Tests for reusing a TrainState across train_loop calls."""
+
+    def test_state_is_reused_across_calls(self, simple_network, training_data):
+        """Test the same optimizer trains on, keeping its step count."""
+        state = TrainState.create(simple_network)
+
+        _, first = train_loop(simple_network, training_data, {"epochs": 20, "learningRate": 0.01}, state)
+        _, second = train_loop(simple_network, training_data, {"epochs": 20, "learningRate": 0.02}, state)
+
+        steps = {int(s["step"]) for s in state.optimizer.state.values()}
+        assert steps == {40}
+        assert state.optimizer.param_groups[0]["lr"] == 0.02
+        assert second["losses"][-1] < first["losses"][0]
+
+
+class TestTrainLoopPrecision:
+    """Tests for mixed-precision training."""
+
+    def test_bf16_loss_decreases(self, simple_network, training_data):
+        """Test bf16 autocast trains, with fp32 losses in the history."""
+        config = {"epochs": 50, "learningRate": 0.01, "precision": "bf16"}
+
+        trained, history = train_loop(simple_network, training_data, config)
+
+        assert history["losses"][0] > history["losses"][-1]
+        assert all(p.dtype == torch.float32 for p in trained.parameters())
+
+    def test_unknown_precision(self, simple_network, training_data):
+        """Test an unknown precision is rejected."""
+        with pytest.raises(ValueError, match="Unknown precision"):
+            train_loop(simple_network, training_data, {"precision": "fp8"})
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA not available")
+class TestTrainLoopCuda:
+    """Tests for training a module that lives on the GPU."""
+
+    def test_cpu_data_trains_cuda_module(self, simple_network, training_data):
+        """Test CPU data, regions and mini-batches follow the module to CUDA."""
+        network = simple_network.cuda()
+        config = {
+            "epochs": 30,
+            "learningRate": 0.01,
+            "batchSize": 2,
+            "precision": "fp16",
+            "maxGradientNorm": 1.0,
+            "forbiddenOutputRegions": [{"dim": 0, "min": 5.0, "max": 6.0}],
+        }
+
+        trained, history = train_loop(network, training_data, config)
+
+        assert all(p.is_cuda for p in trained.parameters())
+        assert history["losses"][0] > history["losses"][-1]
+        assert len(history["constraint_violations"]) == 30
@@ -5,18 +5,26 @@ Tests for core/repository.py - Database abstraction layer.
 """
 
 import pytest
-from orbital_app.core.repository import InMemoryRepository
+from firebase_admin import firestore
+from google.api_core.exceptions import NotFound
+from orbital_app.core.repository import InMemoryRepository, FirestoreRepository
+
+
+@pytest.fixture(scope="module")
+def shared_repository():
+    """One repository for the module; tests must not rely on each other's data."""
+    return InMemoryRepository()
 
 
 class TestInMemoryRepository:
     """Tests for InMemoryRepository."""
 
     @pytest.fixture
-    def repository(self):
-        """Create a fresh repository for each test."""
-        return InMemoryRepository()
+    def repository(self, shared_repository):
+        """The shared repository, emptied for each test."""
+        shared_repository.clear()
+        return shared_repository
 
-    @pytest.mark.asyncio
     async def test_create_entity(self, repository):
         """Test creating an entity."""
         data = {"name": "Test Task", "status": "pending"}
@@ -26,7 +34,6 @@ class TestInMemoryRepository:
         assert result["name"] == "Test Task"
         assert result["status"] == "pending"
 
-    @pytest.mark.asyncio
     async def test_create_with_id(self, repository):
         """Test creating an entity with provided ID."""
         data = {"id": "custom-id", "name": "Test Task"}
@@ -34,7 +41,14 @@ class TestInMemoryRepository:
 
         assert result["id"] == "custom-id"
 
-    @pytest.mark.asyncio
+    async def test_bulk_create(self, repository):
+        """Test creating several entities in one call."""
+        result = await repository.bulk_create("Task", [{"id": "a", "name": "A"}, {"name": "B"}])
+
+        assert [t["name"] for t in result] == ["A", "B"]
+        assert result[0]["id"] == "a" and result[1]["id"]
+        assert await repository.get("Task", result[1]["id"]) == result[1]
+
     async def test_get_entity(self, repository):
         """Test getting an entity by ID."""
         created = await repository.create("Task", {"name": "Test"})
@@ -46,32 +60,44 @@ class TestInMemoryRepository:
         assert result["id"] == entity_id
         assert result["name"] == "Test"
 
-    @pytest.mark.asyncio
     async def test_get_not_found(self, repository):
         """Test getting non-existent entity returns None."""
         result = await repository.get("Task", "non-existent-id")
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_list_entities(self, repository):
-        """Test listing all entities of a type."""
-        await repository.create("Task", {"name": "Task 1"})
-        await repository.create("Task", {"name": "Task 2"})
-        await repository.create("Task", {"name": "Task 3"})
-
-        result = await repository.list("Task")
-
-        assert len(result) == 3
+    @pytest.mark.parametrize(
+        "rows,filter_expr,context,expected_count,expected_status",
+        [
+            # All entities of a type
+            ([{"name": "Task 1"}, {"name": "Task 2"}, {"name": "Task 3"}], None, None, 3, None),
+            # No entities
+            ([], None, None, 0, None),
+            # S-expression filter (only applied with a non-empty context)
+            (
+                [
+                    {"name": "Task 1", "status": "pending"},
+                    {"name": "Task 2", "status": "completed"},
+                    {"name": "Task 3", "status": "pending"},
+                ],
+                ["=", "@entity.status", "pending"],
+                {"dummy": True},
+                2,
+                "pending",
+            ),
+        ],
+        ids=["all", "empty", "filter"],
+    )
+    async def test_list(self, repository, rows, filter_expr, context, expected_count, expected_status):
+        """Test listing entities, with and without a filter."""
+        repository.seed("Task", [dict(row) for row in rows])
+
+        result = await repository.list("Task", filter_expr=filter_expr, context=context)
+
+        assert len(result) == expected_count
+        if expected_status is not None:
+            assert {t["status"] for t in result} == {expected_status}
 
-    @pytest.mark.asyncio
-    async def test_list_empty(self, repository):
-        """Test listing when no entities exist."""
-        result = await repository.list("Task")
-
-        assert result == []
-
-    @pytest.mark.asyncio
     async def test_update_entity(self, repository):
         """Test updating an entity."""
         created = await repository.create("Task", {"name": "Original", "status": "pending"})
@@ -82,7 +108,6 @@ class TestInMemoryRepository:
         assert result["status"] == "completed"
         assert result["name"] == "Original"  # Other fields preserved
 
-    @pytest.mark.asyncio
     async def test_update_not_found(self, repository):
         """Test updating non-existent entity."""
         result = await repository.update("Task", "non-existent", {"status": "done"})
@@ -90,7 +115,6 @@ class TestInMemoryRepository:
         # Returns the update data when entity not found
         assert result["status"] == "done"
 
-    @pytest.mark.asyncio
     async def test_delete_entity(self, repository):
         """Test deleting an entity."""
         created = await repository.create("Task", {"name": "Test"})
@@ -104,28 +128,83 @@ class TestInMemoryRepository:
         deleted = await repository.get("Task", entity_id)
         assert deleted is None
 
-    @pytest.mark.asyncio
     async def test_delete_not_found(self, repository):
         """Test deleting non-existent entity."""
         result = await repository.delete("Task", "non-existent")
 
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_list_with_filter(self, repository):
-        """Test listing with S-expression filter."""
-        await repository.create("Task", {"name": "Task 1", "status": "pending"})
-        await repository.create("Task", {"name": "Task 2", "status": "completed"})
-        await repository.create("Task", {"name": "Task 3", "status": "pending"})
+    async def test_filter_index_tracks_writes(self, repository):
+        """Test equality filters stay correct as entities change."""
+        filter_expr = ["=", "@entity.status", "pending"]
+        context = {"dummy": True}
+        first = await repository.create("Task", {"name": "Task 1", "status": "pending"})
+        await repository.list("Task", filter_expr=filter_expr, context=context)  # builds index
+
+        second = await repository.create("Task", {"name": "Task 2", "status": "pending"})
+        await repository.update("Task", first["id"], {"status": "completed"})
+        await repository.delete("Task", second["id"])
+        third = await repository.update("Task", "task-3", {"status": "pending"})
+
+        result = await repository.list("Task", filter_expr=filter_expr, context=context)
+
+        assert [t["id"] for t in result] == [third["id"]]
 
-        # Note: Filter requires non-empty context to be applied
+    async def test_filter_ignores_caller_mutations(self, repository):
+        """Test changing returned or seeded dicts can't hide rows from a filter."""
         filter_expr = ["=", "@entity.status", "pending"]
-        result = await repository.list("Task", filter_expr=filter_expr, context={"dummy": True})
+        context = {"dummy": True}
+        seeded = {"id": "1", "status": "pending"}
+        repository.seed("Task", [seeded])
+        created = await repository.create("Task", {"id": "2", "status": "pending"})
+        await repository.list("Task", filter_expr=filter_expr, context=context)  # builds index
+
+        seeded["status"] = "completed"
+        created["status"] = "completed"
+        (await repository.get("Task", "1"))["status"] = "completed"
+        for task in await repository.list("Task"):
+            task["status"] = "completed"
+
+        result = await repository.list("Task", filter_expr=filter_expr, context=context)
+
+        assert [t["id"] for t in result] == ["1", "2"]
+
+    async def test_filter_with_several_equalities(self, repository):
+        """Test an and of equalities matches across differently sized buckets."""
+        await repository.bulk_create("Task", [
+            {"id": str(i), "status": "pending", "owner": "a" if i == 0 else "b"}
+            for i in range(5)
+        ])
+        context = {"dummy": True}
+
+        def by_owner(owner):
+            return ["and", ["=", "@entity.status", "pending"], ["=", "@entity.owner", owner]]
+
+        assert [t["id"] for t in await repository.list("Task", by_owner("a"), context)] == ["0"]
+        assert [t["id"] for t in await repository.list("Task", by_owner("b"), context)] == ["1", "2", "3", "4"]
+        assert await repository.list("Task", by_owner("c"), context) == []
+
+        await repository.update("Task", "1", {"owner": "a"})
+
+        assert [t["id"] for t in await repository.list("Task", by_owner("a"), context)] == ["0", "1"]
+
+    async def test_list_with_compound_filter(self, repository):
+        """Test and/or/not and comparison filters with bindings."""
+        await repository.create("Task", {"name": "Task 1", "status": "pending", "priority": 1})
+        await repository.create("Task", {"name": "Task 2", "status": "pending", "priority": 5})
+        await repository.create("Task", {"name": "Task 3", "status": "completed", "priority": 9})
+
+        filter_expr = [
+            "and",
+            ["=", "@entity.status", "@payload.status"],
+            ["or", [">=", "@entity.priority", 5], ["not", ["!=", "@entity.name", "Task 1"]]],
+        ]
+        result = await repository.list(
+            "Task", filter_expr=filter_expr, context={"payload": {"status": "pending"}}
+        )
 
-        assert len(result) == 2
-        assert all(t["status"] == "pending" for t in result)
+        assert sorted(t["name"] for t in result) == ["Task 1", "Task 2"]
 
-    @pytest.mark.asyncio
     async def test_seed_data(self, repository):
         """Test seeding repository with test data."""
         test_data = [
@@ -137,15 +216,286 @@ class TestInMemoryRepository:
         result = await repository.list("Task")
         assert len(result) == 2
 
-    @pytest.mark.asyncio
+    async def test_clear(self, repository):
+        """Test clearing one entity type, then everything."""
+        repository.seed("Task", [{"id": "1", "status": "pending"}])
+        repository.seed("User", [{"id": "u1"}])
+        await repository.list("Task", filter_expr=["=", "@entity.status", "pending"], context={"dummy": True})
+
+        repository.clear("Task")
+        assert await repository.list("Task") == []
+        assert len(await repository.list("User")) == 1
+
+        repository.clear()
+        assert await repository.list("User") == []
+        assert repository._indexes == {}
+
     async def test_multiple_entity_types(self, repository):
         """Test handling multiple entity types."""
-        await repository.create("Task", {"name": "Task 1"})
-        await repository.create("User", {"name": "User 1"})
-        await repository.create("Task", {"name": "Task 2"})
+        repository.seed("Task", [{"name": "Task 1"}, {"name": "Task 2"}])
+        repository.seed("User", [{"name": "User 1"}])
 
         tasks = await repository.list("Task")
         users = await repository.list("User")
 
         assert len(tasks) == 2
         assert len(users) == 1
+
+
+class _FakeDoc:
+    """Minimal Firestore document snapshot."""
+
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = True
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _FakeDocRef:
+    """Document reference identified by its path."""
+
+    def __init__(self, path, db=None):
+        self.path = path
+        self.db = db
+
+    async def delete(self, option=None):
+        if option == {"exists": True} and self.path not in self.db.documents:
+            raise NotFound(self.path)
+        self.db.documents.pop(self.path, None)
+
+
+class _FakeBatch:
+    """Records batched writes and commits them to the fake database."""
+
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, doc_ref, data):
+        self.writes.append(("set", doc_ref.path, data))
+
+    def update(self, doc_ref, data):
+        self.writes.append(("update", doc_ref.path, data))
+
+    def delete(self, doc_ref):
+        self.writes.append(("delete", doc_ref.path, None))
+
+    async def commit(self):
+        # All or nothing: an update of a missing document applies no writes
+        for action, path, _ in self.writes:
+            if action == "update" and path not in self.db.documents:
+                raise NotFound(path)
+        self.db.commits.append(self.writes)
+        for action, path, data in self.writes:
+            if action == "delete":
+                self.db.documents.pop(path, None)
+            elif action == "set":
+                self.db.documents[path] = dict(data)
+            else:
+                self.db.documents[path].update(data)
+
+
+def _fake_matches(doc, filter):
+    """Whether a document passes an == or in FieldFilter (others pass everything)."""
+    if not isinstance(filter, firestore.FieldFilter):
+        return True
+    value = doc.to_dict().get(filter.field_path)
+    if filter.op_string == "==":
+        return value == filter.value
+    if filter.op_string == "in":
+        return value in filter.value
+    return True
+
+
+class _FakeQuery:
+    """Records where() filters and streams canned documents."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.filters = []
+        self.db = None
+
+    def document(self, doc_id):
+        return _FakeDocRef(f"Task/{doc_id}", self.db)
+
+    def where(self, filter=None):
+        # Narrowed queries share the root's filter log
+        self.filters.append(filter)
+        narrowed = _FakeQuery([doc for doc in self.docs if _fake_matches(doc, filter)])
+        narrowed.filters = self.filters
+        narrowed.db = self.db
+        return narrowed
+
+    async def stream(self):
+        for doc in self.docs:
+            yield doc
+
+
+class _FakeDb:
+    """Firestore client whose collections all share one query."""
+
+    def __init__(self, query):
+        self.query = query
+        query.db = self
+        self.documents = {}
+        self.commits = []
+
+    def collection(self, name):
+        return self.query
+
+    def batch(self):
+        return _FakeBatch(self)
+
+    def write_option(self, exists=None):
+        return {"exists": exists}
+
+
+class TestFirestoreRepositoryFilters:
+    """Tests for S-expression filter pushdown in FirestoreRepository."""
+
+    @pytest.fixture
+    def query(self):
+        """Create a query over two pending tasks."""
+        return _FakeQuery([
+            _FakeDoc("1", {"status": "pending", "priority": 3}),
+            _FakeDoc("2", {"status": "pending", "priority": 1}),
+        ])
+
+    @pytest.fixture
+    def repository(self, query):
+        """Create a repository backed by the fake query."""
+        repo = FirestoreRepository()
+        repo._db = _FakeDb(query)
+        return repo
+
+    def test_equality_pushed_down(self, repository, query):
+        """Test equality filter becomes a single FieldFilter."""
+        pushed, residual = repository._build_filter(["=", "@entity.status", "pending"], {})
+
+        assert isinstance(pushed, firestore.FieldFilter)
+        assert (pushed.field_path, pushed.op_string, pushed.value) == ("status", "==", "pending")
+        assert residual is None
+
+    def test_binding_resolved_before_query(self, repository):
+        """Test @payload values are resolved into the Firestore filter."""
+        pushed, _ = repository._build_filter(
+            [">=", "@entity.priority", "@payload.min"], {"payload": {"min": 2}}
+        )
+
+        assert (pushed.op_string, pushed.value) == (">=", 2)
+
+    def test_compiled_filter_resolves_per_context(self, repository):
+        """Test a reused filter resolves its bindings against each context."""
+        expr = ["and", ["=", "@entity.status", "open"], ["=", "@entity.owner", "@user.uid"]]
+
+        first, _ = repository._build_filter(expr, {"user": {"uid": "a"}})
+        second, _ = repository._build_filter(expr, {"user": {"uid": "b"}})
+
+        assert [f.value for f in first.filters] == ["open", "a"]
+        assert [f.value for f in second.filters] == ["open", "b"]
+
+    def test_and_or_pushed_down(self, repository):
+        """Test and/or become composite Firestore filters."""
+        pushed, residual = repository._build_filter(
+            ["and",
+             ["=", "@entity.status", "pending"],
+             ["or", ["<", "@entity.priority", 2], ["in", "@entity.owner", ["a", "b"]]]],
+            {},
+        )
+
+        assert isinstance(pushed, firestore.And)
+        assert isinstance(pushed.filters[1], firestore.Or)
+        assert residual is None
+
+    def test_unsupported_conjunct_left_as_residual(self, repository):
+        """Test only the unsupported part of an and is evaluated client-side."""
+        not_expr = ["not", ["=", "@entity.priority", 1]]
+        pushed, residual = repository._build_filter(
+            ["and", ["=", "@entity.status", "pending"], not_expr], {}
+        )
+
+        assert isinstance(pushed, firestore.FieldFilter)
+        assert residual == not_expr
+
+    async def test_list_applies_residual(self, repository, query):
+        """Test list() pushes the supported filter and applies the residual."""
+        result = await repository.list(
+            "Task",
+            filter_expr=["and", ["=", "@entity.status", "pending"], ["not", ["=", "@entity.priority", 1]]],
+            context={"dummy": True},
+        )
+
+        assert len(query.filters) == 1
+        assert [t["id"] for t in result] == ["1"]
+
+    def test_large_in_split_into_queries(self, repository):
+        """Test an 'in' list over Firestore's limit becomes one filter per chunk."""
+        owners = [f"user-{i}" for i in range(35)]
+        pushed, residual = repository._build_filter(
+            ["and", ["=", "@entity.status", "pending"], ["in", "@entity.owner", owners]], {}
+        )
+
+        assert residual is None
+        assert len(pushed) == 2
+        assert [len(f.filters[1].value) for f in pushed] == [30, 5]
+        assert all(f.filters[0].value == "pending" for f in pushed)
+
+    async def test_list_combines_split_queries(self, repository, query):
+        """Test list() runs the split queries and combines their results."""
+        query.docs.append(_FakeDoc("3", {"status": "pending", "priority": 2}))
+        priorities = list(range(100, 130)) + [3, 1]
+
+        result = await repository.list(
+            "Task",
+            filter_expr=["or", ["in", "@entity.priority", priorities], ["=", "@entity.priority", 3]],
+            context={"dummy": True},
+        )
+
+        assert len(query.filters) == 3
+        assert sorted(t["id"] for t in result) == ["1", "2"]
+
+    async def test_residual_noted_once_per_filter(self, repository, capsys):
+        """Test the client-side filtering note is printed once, not per list()."""
+        filter_expr = ["and", ["=", "@entity.status", "pending"], ["not", ["=", "@entity.priority", 7]]]
+
+        for _ in range(3):
+            await repository.list("Task", filter_expr=filter_expr, context={"dummy": True})
+
+        assert capsys.readouterr().out.count("applying client-side") == 1
+
+    async def test_batch_write_single_commit(self, repository):
+        """Test batch_write commits all ops together."""
+        repository.db.documents["Task/1"] = {"name": "Original", "status": "pending"}
+
+        results = await repository.batch_write([
+            ("create", "Task", None, {"id": "2", "name": "New"}),
+            ("update", "Task", "1", {"status": "done"}),
+            ("delete", "Task", "3", {}),
+        ])
+
+        assert len(repository.db.commits) == 1
+        assert results[0] == {"name": "New", "id": "2"}
+        assert results[1] == {"status": "done", "id": "1"}
+        assert repository.db.documents["Task/1"] == {"name": "Original", "status": "done"}
+        assert results[2] is True
+
+    async def test_batch_write_update_missing_fails_chunk(self, repository):
+        """Test an update of a missing document fails its chunk, applying nothing."""
+        with pytest.raises(NotFound):
+            await repository.batch_write([
+                ("create", "Task", None, {"id": "1", "name": "New"}),
+                ("update", "Task", "missing", {"status": "done"}),
+            ])
+
+        assert repository.db.documents == {}
+
+    async def test_delete_reports_missing(self, repository):
+        """Test delete returns False for a missing document, like InMemoryRepository."""
+        repository.db.documents["Task/1"] = {"name": "One"}
+
+        assert await repository.delete("Task", "1") is True
+        assert await repository.delete("Task", "1") is False
+        assert repository.db.documents == {}
@@ -9,48 +9,61 @@ import torch
 from orbital_app.tensor.contracts import InputContract, OutputContract
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _inference_mode():
+    """No test here needs autograd; skip its bookkeeping on every op."""
+    with torch.inference_mode():
+        yield
+
+
+@pytest.fixture(scope="module")
+def input_contract():
+    """A 4-dim input contract over [0, 1] (shared; treat as read-only)."""
+    return InputContract(
+        shape=[4],
+        range=[0.0, 1.0],
+        meaning=["x", "y", "z", "w"],
+    )
+
+
+@pytest.fixture(scope="module")
+def output_contract():
+    """Create a test output contract (shared; treat as read-only)."""
+    return OutputContract(
+        shape=[4],
+        ranges={
+            "0": {"min": -1.0, "max": 1.0, "meaning": "velocity_x"},
+            "1": {"min": -1.0, "max": 1.0, "meaning": "velocity_y"},
+            "2": {"min": 0.0, "max": 2.0, "meaning": "speed"},
+            "3": {"min": 0.0, "max": 1.0, "meaning": "confidence"},
+        },
+    )
+
+
 class TestInputContract:
     """Tests for InputContract validation."""
 
-    def test_input_contract_valid(self):
+    def test_input_contract_valid(self, input_contract):
         """Test valid input passes validation."""
-        contract = InputContract(
-            shape=[4],
-            range=[0.0, 1.0],
-            meaning=["x", "y", "z", "w"],
-        )
-
         tensor = torch.tensor([0.5, 0.3, 0.7, 0.1])
-        violation = contract.validate(tensor)
+        violation = input_contract.validate(tensor)
 
         assert violation is None
 
-    def test_input_contract_shape_mismatch(self):
+    def test_input_contract_shape_mismatch(self, input_contract):
         """Test shape mismatch detection."""
-        contract = InputContract(
-            shape=[4],
-            range=[0.0, 1.0],
-            meaning=["x", "y", "z", "w"],
-        )
-
         tensor = torch.tensor([0.5, 0.3, 0.7])  # Wrong shape
-        violation = contract.validate(tensor)
+        violation = input_contract.validate(tensor)
 
         assert violation is not None
         assert violation["type"] == "shape_mismatch"
         assert violation["expected"] == [4]
         assert violation["received"] == [3]
 
-    def test_input_contract_out_of_range(self):
+    def test_input_contract_out_of_range(self, input_contract):
         """Test range violation detection."""
-        contract = InputContract(
-            shape=[4],
-            range=[0.0, 1.0],
-            meaning=["x", "y", "z", "w"],
-        )
-
         tensor = torch.tensor([0.5, 1.5, 0.7, -0.5])  # Values out of range
-        violation = contract.validate(tensor)
+        violation = input_contract.validate(tensor)
 
         assert violation is not None
         assert violation["type"] == "out_of_range"
@@ -89,19 +102,6 @@ class TestInputContract:
 class TestOutputContract:
     """Tests for OutputContract clamping and violation detection."""
 
-    @pytest.fixture
-    def output_contract(self):
-        """Create a test output contract."""
-        return OutputContract(
-            shape=[4],
-            ranges={
-                "0": {"min": -1.0, "max": 1.0, "meaning": "velocity_x"},
-                "1": {"min": -1.0, "max": 1.0, "meaning": "velocity_y"},
-                "2": {"min": 0.0, "max": 2.0, "meaning": "speed"},
-                "3": {"min": 0.0, "max": 1.0, "meaning": "confidence"},
-            },
-        )
-
     def test_output_contract_clamp(self, output_contract):
         """Test output clamping to ranges."""
         tensor = torch.tensor([2.0, -2.0, 5.0, 0.5])
@@ -117,24 +117,25 @@ class TestOutputContract:
         tensor = torch.tensor([0.5, -0.5, 1.0, 0.8])
         clamped = output_contract.clamp(tensor)
 
-        assert torch.allclose(tensor, clamped)
+        torch.testing.assert_close(tensor, clamped, rtol=0, atol=0)
 
     def test_output_contract_violations(self, output_contract):
         """Test violation reporting."""
         tensor = torch.tensor([2.0, 0.5, 5.0, 0.5])
         violations = output_contract.get_violations(tensor)
 
-        assert len(violations) == 2
+        by_dim = {v["dim"]: v for v in violations}
+        assert sorted(by_dim) == [0, 2]
 
         # Check first violation
-        v0 = next(v for v in violations if v["dim"] == 0)
+        v0 = by_dim[0]
         assert v0["value"] == 2.0
         assert v0["min"] == -1.0
         assert v0["max"] == 1.0
         assert v0["meaning"] == "velocity_x"
 
         # Check second violation
-        v2 = next(v for v in violations if v["dim"] == 2)
+        v2 = by_dim[2]
         assert v2["value"] == 5.0
         assert v2["meaning"] == "speed"
 
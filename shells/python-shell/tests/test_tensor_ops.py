@@ -32,16 +32,39 @@ from orbital_app.tensor.ops import (
     tensor_max,
     tensor_min,
     tensor_argmax,
+    tensor_argmax_tensor,
     tensor_norm,
+    tensor_stats,
     # Range
     tensor_all_in_range,
     tensor_clamp,
     tensor_clamp_per_dim,
     tensor_out_of_range_dims,
+    _compile_ranges,
     # Conversion
     tensor_to_list,
+    tensor_to_numpy,
 )
 
+# Inputs shared by several tests (treat as read-only)
+_A123 = torch.tensor([1.0, 2.0, 3.0])
+_B456 = torch.tensor([4.0, 5.0, 6.0])
+_TWOS = torch.tensor([2.0, 2.0, 2.0])
+_PEAK_AT_1 = torch.tensor([1.0, 5.0, 3.0, 2.0])
+_UNIT_RANGE = {"min": 0.0, "max": 1.0}
+# For tests that only look at shapes (values are uninitialized)
+_PROTO_234 = torch.empty(2, 3, 4)
+_PROTO_6 = torch.empty(6)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _inference_mode():
+    """No test here needs autograd; skip its bookkeeping on every op."""
+    with torch.inference_mode():
+        yield
+    # Don't hand bounds cached in inference mode to later modules
+    _compile_ranges.cache_clear()
+
 
 class TestTensorCreation:
     """Tests for tensor creation operations."""
@@ -51,7 +74,7 @@ class TestTensorCreation:
         t = tensor_from([1.0, 2.0, 3.0])
         assert t.shape == (3,)
         assert t.dtype == torch.float32
-        assert torch.allclose(t, torch.tensor([1.0, 2.0, 3.0]))
+        torch.testing.assert_close(t, torch.tensor([1.0, 2.0, 3.0]), rtol=0, atol=0)
 
     def test_tensor_zeros(self):
         """Test creating tensor of zeros."""
@@ -69,8 +92,9 @@ class TestTensorCreation:
         """Test creating random tensor [0, 1)."""
         t = tensor_rand([10])
         assert t.shape == (10,)
-        assert t.min().item() >= 0.0
-        assert t.max().item() < 1.0
+        stats = tensor_stats(t, ["min", "max"])
+        assert stats["min"] >= 0.0
+        assert stats["max"] < 1.0
 
     def test_tensor_randn(self):
         """Test creating random normal tensor."""
@@ -85,8 +109,7 @@ class TestTensorShapeIndexing:
 
     def test_tensor_shape(self):
         """Test getting tensor shape."""
-        t = tensor_zeros([2, 3, 4])
-        shape = tensor_shape(t)
+        shape = tensor_shape(_PROTO_234)
         assert shape == [2, 3, 4]
 
     def test_tensor_get(self):
@@ -101,18 +124,16 @@ class TestTensorShapeIndexing:
         t = tensor_from([1.0, 2.0, 3.0, 4.0, 5.0])
         sliced = tensor_slice(t, 1, 4)
         assert sliced.shape == (3,)
-        assert torch.allclose(sliced, torch.tensor([2.0, 3.0, 4.0]))
+        torch.testing.assert_close(sliced, torch.tensor([2.0, 3.0, 4.0]), rtol=0, atol=0)
 
     def test_tensor_reshape(self):
         """Test reshaping tensor."""
-        t = tensor_zeros([6])
-        reshaped = tensor_reshape(t, [2, 3])
+        reshaped = tensor_reshape(_PROTO_6, [2, 3])
         assert reshaped.shape == (2, 3)
 
     def test_tensor_flatten(self):
         """Test flattening tensor."""
-        t = tensor_zeros([2, 3, 4])
-        flat = tensor_flatten(t)
+        flat = tensor_flatten(_PROTO_234)
         assert flat.shape == (24,)
 
 
@@ -121,31 +142,26 @@ class TestTensorMath:
 
     def test_tensor_add(self):
         """Test element-wise addition."""
-        a = tensor_from([1.0, 2.0, 3.0])
-        b = tensor_from([4.0, 5.0, 6.0])
-        result = tensor_add(a, b)
-        assert torch.allclose(result, torch.tensor([5.0, 7.0, 9.0]))
+        result = tensor_add(_A123, _B456)
+        torch.testing.assert_close(result, torch.tensor([5.0, 7.0, 9.0]), rtol=0, atol=0)
 
     def test_tensor_sub(self):
         """Test element-wise subtraction."""
         a = tensor_from([5.0, 5.0, 5.0])
-        b = tensor_from([1.0, 2.0, 3.0])
-        result = tensor_sub(a, b)
-        assert torch.allclose(result, torch.tensor([4.0, 3.0, 2.0]))
+        result = tensor_sub(a, _A123)
+        torch.testing.assert_close(result, torch.tensor([4.0, 3.0, 2.0]), rtol=0, atol=0)
 
     def test_tensor_mul(self):
         """Test element-wise multiplication."""
         a = tensor_from([2.0, 3.0, 4.0])
-        b = tensor_from([2.0, 2.0, 2.0])
-        result = tensor_mul(a, b)
-        assert torch.allclose(result, torch.tensor([4.0, 6.0, 8.0]))
+        result = tensor_mul(a, _TWOS)
+        torch.testing.assert_close(result, torch.tensor([4.0, 6.0, 8.0]), rtol=0, atol=0)
 
     def test_tensor_div(self):
         """Test element-wise division."""
         a = tensor_from([4.0, 6.0, 8.0])
-        b = tensor_from([2.0, 2.0, 2.0])
-        result = tensor_div(a, b)
-        assert torch.allclose(result, torch.tensor([2.0, 3.0, 4.0]))
+        result = tensor_div(a, _TWOS)
+        torch.testing.assert_close(result, torch.tensor([2.0, 3.0, 4.0]), rtol=0, atol=0)
 
     def test_tensor_matmul(self):
         """Test matrix multiplication."""
@@ -153,14 +169,12 @@ class TestTensorMath:
         b = torch.tensor([[5.0, 6.0], [7.0, 8.0]])
         result = tensor_matmul(a, b)
         expected = torch.tensor([[19.0, 22.0], [43.0, 50.0]])
-        assert torch.allclose(result, expected)
+        torch.testing.assert_close(result, expected)
 
     def test_tensor_dot(self):
         """Test dot product."""
-        a = tensor_from([1.0, 2.0, 3.0])
-        b = tensor_from([4.0, 5.0, 6.0])
-        result = tensor_dot(a, b)
-        assert result == 32.0  # 1*4 + 2*5 + 3*6
+        result = tensor_dot(_A123, _B456)
+        assert result == pytest.approx(32.0)  # 1*4 + 2*5 + 3*6
 
 
 class TestTensorReductions:
@@ -169,32 +183,62 @@ class TestTensorReductions:
     def test_tensor_sum(self):
         """Test sum of all elements."""
         t = tensor_from([1.0, 2.0, 3.0, 4.0])
-        assert tensor_sum(t) == 10.0
+        result = tensor_sum(t)
+        # Reductions return Python scalars, so comparisons don't touch torch
+        assert type(result) is float
+        assert result == pytest.approx(10.0)
 
     def test_tensor_mean(self):
         """Test mean of all elements."""
         t = tensor_from([1.0, 2.0, 3.0, 4.0])
-        assert tensor_mean(t) == 2.5
+        assert tensor_mean(t) == pytest.approx(2.5)
 
     def test_tensor_max(self):
         """Test max element."""
-        t = tensor_from([1.0, 5.0, 3.0, 2.0])
-        assert tensor_max(t) == 5.0
+        assert tensor_max(_PEAK_AT_1) == 5.0
 
     def test_tensor_min(self):
         """Test min element."""
-        t = tensor_from([1.0, 5.0, 3.0, 2.0])
-        assert tensor_min(t) == 1.0
+        assert tensor_min(_PEAK_AT_1) == 1.0
 
     def test_tensor_argmax(self):
         """Test index of max element."""
-        t = tensor_from([1.0, 5.0, 3.0, 2.0])
-        assert tensor_argmax(t) == 1
+        result = tensor_argmax(_PEAK_AT_1)
+        assert type(result) is int
+        assert result == 1
+
+    def test_tensor_argmax_tensor(self):
+        """Test argmax stays a tensor until the caller reads it."""
+        index = tensor_argmax_tensor(_PEAK_AT_1)
+        assert isinstance(index, torch.Tensor)
+        assert index.dim() == 0 and index.item() == 1
 
     def test_tensor_norm(self):
         """Test L2 norm."""
         t = tensor_from([3.0, 4.0])
-        assert tensor_norm(t) == 5.0  # sqrt(9 + 16)
+        assert tensor_norm(t) == pytest.approx(5.0)  # sqrt(9 + 16)
+
+
+    def test_tensor_stats(self):
+        """Test stats computed together match the individual reductions."""
+        t = tensor_from([3.0, -4.0, 1.0])
+
+        stats = tensor_stats(t)
+
+        assert stats == pytest.approx({
+            "sum": tensor_sum(t),
+            "mean": tensor_mean(t),
+            "max": tensor_max(t),
+            "min": tensor_min(t),
+            "argmax": tensor_argmax(t),
+            "norm": tensor_norm(t),
+        })
+        assert tensor_stats(t, ["min", "argmax"]) == {"min": -4.0, "argmax": 0}
+
+    def test_tensor_stats_unknown(self):
+        """Test unknown stat names are rejected."""
+        with pytest.raises(ValueError):
+            tensor_stats(tensor_from([1.0]), ["median"])
 
 
 class TestTensorRangeValidation:
@@ -210,32 +254,61 @@ class TestTensorRangeValidation:
         t = tensor_from([0.5, 1.5, 0.7])
         assert tensor_all_in_range(t, [0.0, 1.0]) is False
 
+    def test_tensor_all_in_range_edge_cases(self):
+        """Test empty tensors pass and NaN fails, as with element-wise checks."""
+        assert tensor_all_in_range(tensor_from([]), [0.0, 1.0]) is True
+        assert tensor_all_in_range(tensor_from([0.5, float("nan")]), [0.0, 1.0]) is False
+
     def test_tensor_clamp(self):
         """Test clamping all elements."""
         t = tensor_from([-1.0, 0.5, 2.0])
         result = tensor_clamp(t, 0.0, 1.0)
-        assert torch.allclose(result, torch.tensor([0.0, 0.5, 1.0]))
+        torch.testing.assert_close(result, torch.tensor([0.0, 0.5, 1.0]), rtol=0, atol=0)
 
     def test_tensor_clamp_per_dim(self):
         """Test per-dimension clamping."""
         t = tensor_from([2.0, -1.0, 0.5])
-        ranges = {
-            "0": {"min": 0.0, "max": 1.0},
-            "1": {"min": 0.0, "max": 1.0},
-        }
+        ranges = {"0": _UNIT_RANGE, "1": _UNIT_RANGE}
         result = tensor_clamp_per_dim(t, ranges)
         assert result[0].item() == 1.0  # clamped from 2.0
         assert result[1].item() == 0.0  # clamped from -1.0
         assert result[2].item() == 0.5  # unchanged
 
+    def test_tensor_clamp_per_dim_rows(self):
+        """Test dims index the first axis, clamping whole rows of a matrix."""
+        t = torch.tensor([[2.0, -1.0], [0.5, 3.0]])
+        result = tensor_clamp_per_dim(t, {"1": _UNIT_RANGE})
+        assert result.tolist() == [[2.0, -1.0], [0.5, 1.0]]
+        assert t[1, 1].item() == 3.0  # input untouched
+
+    def test_tensor_clamp_per_dim_differentiable(self):
+        """Test bounds cached by an inference-mode clamp still support backward."""
+        ranges = {"0": {"min": 0.0, "max": 0.25}, "1": {"min": 0.0, "max": 0.75}}
+        tensor_clamp_per_dim(tensor_from([0.5, 0.1]), ranges)
+
+        with torch.inference_mode(False):
+            x = torch.tensor([0.5, 0.1], requires_grad=True)
+            tensor_clamp_per_dim(x, ranges).sum().backward()
+
+        assert x.grad.tolist() == [0.0, 1.0]
+
+    def test_tensor_out_of_range_dims_requires_grad(self):
+        """Test range checks outside inference mode, on a tensor that needs grad."""
+        ranges = {"0": _UNIT_RANGE, "1": _UNIT_RANGE}
+
+        with torch.inference_mode(False):
+            x = torch.tensor([2.0, 0.5], requires_grad=True)
+            violations = tensor_out_of_range_dims(x, ranges)
+            clamped = tensor_clamp_per_dim(x, ranges)
+            clamped.sum().backward()
+
+        assert [v["dim"] for v in violations] == [0]
+        assert x.grad.tolist() == [0.0, 1.0]
+
     def test_tensor_out_of_range_dims(self):
         """Test detecting out of range dimensions."""
         t = tensor_from([2.0, 0.5, -1.0])
-        ranges = {
-            "0": {"min": 0.0, "max": 1.0},
-            "1": {"min": 0.0, "max": 1.0},
-            "2": {"min": 0.0, "max": 1.0},
-        }
+        ranges = {"0": _UNIT_RANGE, "1": _UNIT_RANGE, "2": _UNIT_RANGE}
         violations = tensor_out_of_range_dims(t, ranges)
         assert len(violations) == 2
         assert violations[0]["dim"] == 0
@@ -258,3 +331,11 @@ class TestTensorConversion:
         t = torch.tensor([[1.0, 2.0], [3.0, 4.0]])
         result = tensor_to_list(t)
         assert result == [[1.0, 2.0], [3.0, 4.0]]
+
+    def test_tensor_to_numpy(self):
+        """Test conversion to a NumPy array that shares the tensor's memory."""
+        pytest.importorskip("numpy")
+        t = tensor_from([1.0, 2.0, 3.0])
+        arr = tensor_to_numpy(t)
+        t[0] = 5.0
+        assert arr.tolist() == [5.0, 2.0, 3.0]